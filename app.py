@@ -4,7 +4,7 @@ import time
 import uuid
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response
-from werkzeug.utils import secure_filename
+from markupsafe import Markup
 import ollama
 
 # --- ARAÇ IMPORTLARI ---
@@ -23,10 +23,18 @@ from dastan.ai_logic import get_ai_config, get_ai_response
 from github import Github, GithubException
 from cryptography.fernet import Fernet
 
+# --- STORAGE ---
+from storage import (DocumentStore, JsonFileBackend, JournalBackend, JournalCompactor,
+                     SqliteBackend, ShardedBackend, WriteBehindFlusher, SortedView,
+                     encode_cursor, decode_cursor, Counters)
+from qa import (SearchIndex, TitleAutocomplete, DuplicateIndex, TagIndex, ViewCounter, normalize_tags,
+                hot_score, voter_id, has_voted, set_vote, reply_parent_id, build_tree, window)
+from web import FragmentCache, RoadmapData, AssetManifest, serve_built, version_etag, conditional_json, content_etag_json, encoded_response
+from media import (UploadStore, UploadCollector, normalize_extension, make_avatar_variants,
+                   extract_inline_images)
+
 app = Flask(__name__, static_url_path='/static')
 app.secret_key = 'your_secret_key_here'
-import threading
-db_lock = threading.Lock()
 
 #Ollama pull llama3.2:3b
 ollama.pull("llama3.2:3b")
@@ -35,6 +43,8 @@ UPLOAD_FOLDER = os.path.join('static', 'images', 'uploads')
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
+# Yüklənən fayllar məzmunun SHA-256 hash-i ilə saxlanılır (eyni fayl bir dəfə yazılır)
+uploads = UploadStore(UPLOAD_FOLDER)
 
 # Local JSON file paths
 USERS_DB_FILE = os.path.join('static', 'techhub_users_db.json')
@@ -63,56 +73,183 @@ def decrypt_token(encrypted_token):
 
 # --- 📡 LOCAL JSON FUNCTIONS ---
 
-def load_json(db_type_key):
-    """Load data from local JSON file"""
-    if 'user' in str(db_type_key).lower():
-        db_file = USERS_DB_FILE
-        default_data = {}
-    elif 'project' in str(db_type_key).lower():
-        db_file = PROJECTS_DB_FILE
-        default_data = []
-    else:
-        db_file = QA_DB_FILE
-        default_data = []
-    
-    if not os.path.exists(db_file):
-        return default_data
-    
+# TECHHUB_STORAGE=journal appends Q&A changes to a log instead of rewriting the file,
+# TECHHUB_STORAGE=sqlite keeps everything in an indexed SQLite database,
+# TECHHUB_STORAGE=sharded keeps one file per question/user/project
+# (import the JSON files first with: python -m storage.migrate [--backend sharded])
+STORAGE_MODE = os.environ.get('TECHHUB_STORAGE', 'json')
+SQLITE_DB_FILE = os.environ.get('TECHHUB_SQLITE_PATH', os.path.join('static', 'techhub.sqlite3'))
+SHARD_DIR = os.environ.get('TECHHUB_SHARD_DIR', os.path.join('static', 'techhub_db'))
+# Seconds lastLogin/answerCount/roadmap updates may wait in memory before being written (0 = write at once)
+FLUSH_INTERVAL = float(os.environ.get('TECHHUB_FLUSH_INTERVAL', '5'))
+# Seconds view counts are buffered; on the JSON files they go to VIEWS_DB_FILE until the next real Q&A write
+VIEW_FLUSH_INTERVAL = float(os.environ.get('TECHHUB_VIEW_FLUSH_INTERVAL', '60'))
+VIEWS_DB_FILE = os.path.join('static', 'techhub_views.json')
+VIEW_DEDUP_WINDOW = 30 * 60
+DB_PATHS = {
+    'users': USERS_DB_FILE,
+    'qa': QA_DB_FILE,
+    'projects': PROJECTS_DB_FILE,
+}
+
+# `python app.py` (debug=True) runs this module twice: in the reloader's watcher process and in
+# the server it restarts. Background jobs that write files only run in the serving process.
+SERVING_PROCESS = __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+
+# Resident copy of the JSON files; reads no longer re-parse them on every request
+if STORAGE_MODE == 'journal':
+    store = DocumentStore(JournalBackend(DB_PATHS))
+    if SERVING_PROCESS:
+        JournalCompactor(store).start()
+elif STORAGE_MODE == 'sqlite':
+    store = DocumentStore(SqliteBackend(SQLITE_DB_FILE))
+elif STORAGE_MODE == 'sharded':
+    store = DocumentStore(ShardedBackend(SHARD_DIR))
+else:
+    store = DocumentStore(JsonFileBackend(DB_PATHS))
+
+# Baxış sayları yaddaşda toplanır və flusher ilə toplu şəkildə yazılır
+view_counter = ViewCounter(window=VIEW_DEDUP_WINDOW, path=VIEWS_DB_FILE)
+if SERVING_PROCESS:
+    if FLUSH_INTERVAL > 0:
+        WriteBehindFlusher(store, FLUSH_INTERVAL).start()
+    WriteBehindFlusher(store, VIEW_FLUSH_INTERVAL, sources=[view_counter]).start()
+
+# Heç yerdə istinad olunmayan yükləmələr (köhnə avatar, silinmiş sualın şəkilləri) vaxtaşırı silinir
+UPLOAD_GC_HOURS = float(os.environ.get('TECHHUB_UPLOAD_GC_HOURS', '24'))
+UPLOAD_GC_GRACE_DAYS = float(os.environ.get('TECHHUB_UPLOAD_GC_GRACE_DAYS', '7'))
+upload_collector = UploadCollector(store, UPLOAD_FOLDER, grace=UPLOAD_GC_GRACE_DAYS * 24 * 3600,
+                                   quarantine=os.environ.get('TECHHUB_UPLOAD_QUARANTINE') or None,
+                                   interval=UPLOAD_GC_HOURS * 3600)
+if UPLOAD_GC_HOURS > 0 and SERVING_PROCESS:
+    upload_collector.start()
+
+# Secondary indexes behind store.find(); kept up to date on every change
+store.add_index('qa', 'category')
+store.add_index('qa', 'author_email')
+store.add_index('projects', 'author_email')
+store.add_index('projects', 'github_repo')
+store.add_index('projects', 'synced', normalize=bool)
+
+# Pre-sorted question lists (newest first), updated incrementally instead of sorted() per request
+store.add_view('yeni-sorgu', SortedView('qa', lambda q: q.get('timestamp', 0)))
+store.add_view('populyar', SortedView('qa', hot_score))
+store.add_view('cavabsiz', SortedView('qa', lambda q: q.get('timestamp', 0),
+                                      predicate=lambda q: len(q.get('answers', [])) == 0))
+store.add_view('kateqoriya', SortedView('qa', lambda q: q.get('timestamp', 0),
+                                        partition=lambda q: q.get('category')))
+
+# Full-text (BM25) index over titles, content and answers
+store.add_view('search', SearchIndex('qa'))
+# Başlıq prefiksləri (sual yazarkən təkliflər)
+store.add_view('autocomplete', TitleAutocomplete('qa'))
+# MinHash/LSH: yeni sualın təkrarlarını tapmaq üçün
+store.add_view('duplicates', DuplicateIndex('qa'))
+# Teq → suallar və facet sayları
+store.add_view('tags', TagIndex('qa'))
+DUPLICATE_THRESHOLD = 0.5
+AI_REUSE_THRESHOLD = 0.8
+AI_EMAIL = "ai@techhub.com"
+
+# Sayğaclar: hər dəyişiklikdə yenilənir, /api/stats yaddaşdan cavab verir
+store.add_view('qa_stats', Counters('qa', measures={
+    'questions': lambda q: 1,
+    'answers': lambda q: len(q.get('answers', [])),
+    'unanswered': lambda q: 0 if q.get('answers') else 1,
+}, groups={'categories': lambda q: q.get('category')}))
+store.add_view('project_stats', Counters('projects', measures={
+    'projects': lambda p: 1,
+    'synced_projects': lambda p: 1 if p.get('synced') else 0,
+}))
+
+# Render olunmuş sual kartları və cavab blokları (id + versiya ilə, LRU)
+fragment_cache = store.add_view('fragments', FragmentCache(
+    'qa', children=lambda q: {a['id']: a for a in q.get('answers', []) if a.get('id')},
+    max_bytes=16 * 1024 * 1024, ignore=('views',)))
+
+# Roadmap dərsləri yaddaşda hazır JSON/gzip şəklində saxlanılır, fayl dəyişəndə yenidən yüklənir
+roadmap_data = RoadmapData(os.path.join('static', 'roadmap_data.json'))
+
+QA_CATEGORIES = ['python', 'linux', 'web', 'java', 'cpp', 'go', 'ruby', 'db', 'security', 'mobile']
+CATEGORY_PAGE_SIZE = 20
+# Cavab ağacı: ilk səhifədə göstərilən kök cavablar, hər cavabın altında göstərilən alt cavablar və dərinlik
+ANSWER_PAGE_SIZE = 20
+REPLY_PAGE_SIZE = 3
+REPLY_DEPTH = 3
+
+def collection_name(db_type_key):
+    """Map a db key ("users", "projects", "qa"...) to a store collection"""
+    key = str(db_type_key).lower()
+    if 'user' in key: return 'users'
+    elif 'project' in key: return 'projects'
+    return 'qa'
+
+def put_item(db_type_key, item, key=None):
+    """Save a single question/user/project instead of the whole file"""
     try:
-        with open(db_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return default_data
-
-def save_json(db_type_key, data):
-    """Save data to local JSON file"""
-    if 'user' in str(db_type_key).lower():
-        db_file = USERS_DB_FILE
-    elif 'project' in str(db_type_key).lower():
-        db_file = PROJECTS_DB_FILE
-    else:
-        db_file = QA_DB_FILE
-    
+        store.put(collection_name(db_type_key), item, key)
+        return True
+    except Exception as e:
+        print(f"❌ Save Error: {e}")
+        return False
+
+def modify_item(db_type_key, key, fn, defer=False):
+    """Read-modify-write one entity; fn gets a private copy and may run more than once.
+
+    defer=True is for small hot updates: visible immediately, written on the next flush.
+    """
+    try:
+        return store.modify(collection_name(db_type_key), key, fn, defer=defer and FLUSH_INTERVAL > 0)
+    except Exception as e:
+        print(f"❌ Save Error: {e}")
+        return None
+
+def delete_item(db_type_key, key):
+    """Remove a single question/user/project"""
     try:
-        with db_lock:
-            with open(db_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+        store.delete(collection_name(db_type_key), key)
         return True
     except Exception as e:
         print(f"❌ Save Error: {e}")
         return False
 
 # Yardımcılar
-def load_users(): return load_json("users")
-def save_users(users): return save_json("users", users)
-def load_projects(): return load_json("projects")
-def save_projects(projects): return save_json("projects", projects)
 def get_timestamp(): return int(time.time() * 1000)
 def format_time(timestamp):
     return datetime.fromtimestamp(timestamp / 1000).strftime('%d.%m.%Y %H:%M')
 
 app.jinja_env.filters['format_time'] = format_time
 
+# JS/CSS: `python -m web.assets` ilə yığılmış (minify + hash + gzip) fayllar, yoxdursa orijinal fayl
+asset_manifest = AssetManifest(app.static_folder)
+app.jinja_env.globals['asset_url'] = asset_manifest.url
+
+@app.route('/static/dist/<path:filename>')
+def built_asset(filename):
+    return serve_built(app.static_folder, filename)
+
+MODERATOR_ROLES = ['Administrator', 'Moderator', 'Staff']
+
+@app.template_global()
+def avatar_url(url, size):
+    """Resized copy (32/64/256 px) of an uploaded avatar, or the photo URL itself"""
+    return uploads.variant_url(url.replace('../', '/'), size)
+
+@app.template_global()
+def question_card(q):
+    user = session['user']
+    can_delete = user['email'] == q.get('author_email') or user.get('role') in MODERATOR_ROLES
+    return Markup(fragment_cache.get_or_render(q['id'], can_delete, lambda: render_template(
+        'Q&A_card.html', q=q, can_delete=can_delete)))
+
+@app.template_global()
+def answer_card(question, ans, voted_ids):
+    user = session['user']
+    can_delete = user['email'] == ans.get('author_email') or user.get('role') in MODERATOR_ROLES
+    voted = ans['id'] in voted_ids
+    return Markup(fragment_cache.get_or_render((question['id'], ans['id']), (can_delete, voted), lambda: render_template(
+        'Q&A_answer_card.html', question=question, ans=ans, can_delete=can_delete, voted=voted)))
+
 def strip_html(text):
     import re
     if not text: return ""
@@ -160,28 +297,51 @@ def home():
 @app.route('/dashboard')
 def dashboard():
     if 'user' not in session: return redirect(url_for('home'))
-    all_questions = load_json("qa")
-    sorted_questions = sorted(all_questions, key=lambda x: x['timestamp'], reverse=True)
-    recent_activity = sorted_questions[:3]
+    recent_activity = store.view('yeni-sorgu').items(limit=3)
     return render_template('index.html', recent_activity=recent_activity)
 
 @app.route('/api/user')
 def get_user():
-    if 'user' in session: return jsonify(session['user'])
-    return jsonify(None)
+    return content_etag_json(session.get('user'), private=True)
+
+@app.route('/api/store/stats')
+def get_store_stats():
+    if 'user' not in session: return jsonify({'success': False}), 401
+    stats = store.stats()
+    stats['fragments'] = fragment_cache.stats()
+    return jsonify(stats)
 
 @app.route('/api/qa-count')
 def get_qa_count():
-    all_questions = load_json("qa")
-    return jsonify({'count': len(all_questions)})
+    return conditional_json(version_etag(store, 'qa'),
+                            lambda: {'count': store.view('qa_stats').snapshot()['questions']},
+                            store.last_modified('qa'))
+
+@app.route('/api/stats')
+def site_stats():
+    stats = store.view('qa_stats').snapshot()
+    stats.update(store.view('project_stats').snapshot())
+    stats['users'] = store.count('users')
+    return jsonify({'success': True, 'stats': stats})
+
+@app.route('/api/admin/uploads/gc', methods=['POST'])
+def collect_uploads():
+    if 'user' not in session: return jsonify({'success': False}), 401
+    if session['user'].get('role') not in MODERATOR_ROLES:
+        return jsonify({'success': False, 'message': 'İcazəniz yoxdur'}), 403
+    dry_run = bool((request.get_json(silent=True) or {}).get('dry_run'))
+    try:
+        return jsonify({'success': True, 'dry_run': dry_run, 'report': upload_collector.run_once(dry_run)})
+    except Exception as e:
+        print(f"❌ Uploads GC error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
 
 @app.route('/profile')
 def profile():
     if 'user' not in session: return redirect(url_for('home'))
     
     # Get user's projects
-    projects = load_projects()
-    user_projects = [p for p in projects if p.get('author_email') == session['user']['email']]
+    user_projects = store.find('projects', 'author_email', session['user']['email'])
     
     return render_template('profile.html', user=session['user'], projects=user_projects)
 
@@ -198,11 +358,25 @@ def roadmap():
 @app.route('/api/roadmap/data')
 def get_roadmap_data():
     try:
-        data_path = os.path.join('static', 'roadmap_data.json')
-        if os.path.exists(data_path):
-            with open(data_path, 'r', encoding='utf-8') as f:
-                return jsonify(json.load(f))
-        return jsonify({'roadmaps': []})
+        return encoded_response(roadmap_data.full())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/roadmap/tracks')
+def get_roadmap_tracks():
+    """Roadmap list without lessons (id, title, description, icon, node_count)"""
+    try:
+        return encoded_response(roadmap_data.summary())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/roadmap/data/<roadmap_id>')
+def get_roadmap_track(roadmap_id):
+    try:
+        track = roadmap_data.track(roadmap_id)
+        if track is None:
+            return jsonify({'error': 'Roadmap not found'}), 404
+        return encoded_response(track)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -210,9 +384,8 @@ def get_roadmap_data():
 def get_roadmap_status():
     if 'user' not in session: return jsonify({'success': False}), 401
     user_email = session['user']['email']
-    users = load_users()
-    user = users.get(user_email, {})
-    return jsonify(user.get('roadmap_progress', {}))
+    user = store.get('users', user_email) or {}
+    return content_etag_json(user.get('roadmap_progress', {}), private=True)
 
 @app.route('/api/roadmap/complete', methods=['POST'])
 def complete_roadmap_node():
@@ -222,27 +395,26 @@ def complete_roadmap_node():
     node_id = data.get('node_id')
     
     user_email = session['user']['email']
-    users = load_users()
-    user = users.get(user_email, {})
-    
-    progress = user.get('roadmap_progress', {})
-    if roadmap_id not in progress:
-        progress[roadmap_id] = []
     
-    if node_id not in progress[roadmap_id]:
-        progress[roadmap_id].append(node_id)
+    def complete(user):
+        progress = user.get('roadmap_progress', {})
+        if roadmap_id not in progress:
+            progress[roadmap_id] = []
         
-    user['roadmap_progress'] = progress
-    
-    # Optional: Reward user
-    user['answerCount'] = user.get('answerCount', 0) + 5 # 5 points for completing a lesson
-    user['role'] = update_role_logic(user)
+        if node_id not in progress[roadmap_id]:
+            progress[roadmap_id].append(node_id)
+            
+        user['roadmap_progress'] = progress
+        
+        # Optional: Reward user
+        user['answerCount'] = user.get('answerCount', 0) + 5 # 5 points for completing a lesson
+        user['role'] = update_role_logic(user)
     
-    users[user_email] = user
-    save_users(users)
+    user = modify_item("users", user_email, complete, defer=True)
+    if not user: return jsonify({'success': False}), 404
     session['user'] = user
     
-    return jsonify({'success': True, 'progress': progress, 'new_role': user['role']})
+    return jsonify({'success': True, 'progress': user['roadmap_progress'], 'new_role': user['role']})
 
 @app.route('/api/roadmap/hint', methods=['POST'])
 def get_roadmap_hint():
@@ -264,28 +436,34 @@ def github():
 @app.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
-    users = load_users()
     email, pwd = data.get('email'), data.get('password')
-    if email in users and users[email]['password'] == pwd:
-        users[email]['lastLogin'] = get_timestamp()
-        session['user'] = users[email]
-        save_users(users)
-        return jsonify({'success': True, 'user': users[email]})
+    user = store.get('users', email) if email else None
+    if user and user['password'] == pwd:
+        now = get_timestamp()
+        user = modify_item("users", email, lambda u: u.update(lastLogin=now), defer=True)
+        if not user: return jsonify({'success': False, 'message': 'Giriş zamanı yazıla bilmədi'}), 500
+        session['user'] = user
+        return jsonify({'success': True, 'user': user})
     return jsonify({'success': False, 'message': 'Hatalı giriş'}), 401
 
 @app.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
     email = data.get('email')
-    users = load_users()
-    if email in users: return jsonify({'success': False, 'message': 'Email already registered'}), 400
     new_user = {
         "name": data.get('name'), "email": email, "password": data.get('password'),
         "createdAt": get_timestamp(), "role": "Yeni", "answerCount": 0, "queryCount": 0,
         "photo": "", "about": "", "location": "", "github_token": None, "github_username": None
     }
-    users[email] = new_user
-    save_users(users)
+    
+    def create(txn):
+        # Checked inside the transaction so two sign-ups with one email can't both win
+        if txn.get(email) is not None: return False
+        txn.put(new_user, email)
+        return True
+    
+    if not store.update('users', create):
+        return jsonify({'success': False, 'message': 'Email already registered'}), 400
     session['user'] = new_user
     return jsonify({'success': True, 'user': new_user})
 
@@ -298,69 +476,137 @@ def logout():
 @app.route('/Q&A')
 def Q_and_A():
     if 'user' not in session: return redirect(url_for('home'))
-    all_questions = load_json("qa")
-    sorted_questions = sorted(all_questions, key=lambda x: x['timestamp'], reverse=True)
-    return render_template('Q&A.html', user=session['user'], recent_activity=sorted_questions[:10])
+    recent_activity = store.view('yeni-sorgu').items(limit=10)
+    return render_template('Q&A.html', user=session['user'], recent_activity=recent_activity)
 
 @app.route('/Q&A/<category>')
 def Q_and_A_category(category):
     if 'user' not in session: return redirect(url_for('home'))
-    if category not in ['python', 'linux', 'web', 'java', 'cpp', 'go', 'ruby', 'db', 'security', 'mobile']: return "Kategoriya tapılmadı", 404
-    all_questions = load_json("qa")
-    cat_questions = [q for q in all_questions if q.get('category') == category]
-    return render_template(f'Q&A_{category}.html', questions=cat_questions, user=session['user'])
+    if category not in QA_CATEGORIES: return "Kategoriya tapılmadı", 404
+    cursor = request.args.get('cursor')
+    tag = (normalize_tags([request.args.get('tag', '')]) or [None])[0]
+    try:
+        position = decode_cursor(cursor) if cursor else None
+        if tag:
+            q_ids, next_position = store.view('tags').page(tag, category=category, cursor=position, limit=CATEGORY_PAGE_SIZE)
+            cat_questions = [q for q in (store.get('qa', q_id) for q_id in q_ids) if q]
+        else:
+            cat_questions, next_position = store.view('kateqoriya').page(position, CATEGORY_PAGE_SIZE, partition=category)
+    except (ValueError, TypeError):
+        return redirect(url_for('Q_and_A_category', category=category))
+    next_cursor = encode_cursor(next_position) if next_position else None
+    return render_template(f'Q&A_{category}.html', questions=cat_questions, user=session['user'],
+                           next_cursor=next_cursor, is_first_page=cursor is None, active_tag=tag)
 
 @app.route('/Q&A/view/<question_id>')
 def view_question(question_id):
     if 'user' not in session: return redirect(url_for('home'))
-    all_questions = load_json("qa")
-    question = next((q for q in all_questions if q['id'] == question_id), None)
+    question = store.get('qa', question_id)
     if not question: return "Sual tapılmadı", 404
-    return render_template('Q&A_detail.html', question=question, user=session['user'])
+    view_counter.record(question_id, viewer=session['user']['email'])
+    views = question.get('views', 0) + view_counter.pending(question_id)
+    voter = voter_id(session['user']['email'])
+    voted = {item['id'] for item in [question] + question.get('answers', []) if has_voted(item, voter)}
+    roots, _ = build_tree(question.get('answers', []))
+    nodes = window(roots, 0, ANSWER_PAGE_SIZE, REPLY_PAGE_SIZE, REPLY_DEPTH)
+    return render_template('Q&A_detail.html', question=question, user=session['user'], views=views, voted=voted,
+                           nodes=nodes, more_answers=max(len(roots) - len(nodes), 0), next_offset=len(nodes))
+
+@app.route('/api/question/<question_id>/answers')
+def load_answers(question_id):
+    """Render one more page of a thread level (parent='' for answers to the question itself)"""
+    if 'user' not in session: return jsonify({'success': False, 'message': 'Giriş edilməyib'}), 401
+    question = store.get('qa', question_id)
+    if not question: return jsonify({'success': False, 'message': 'Sual tapılmadı'}), 404
+    parent_id = request.args.get('parent') or None
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(max(int(request.args.get('limit', ANSWER_PAGE_SIZE)), 1), 100)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Yanlış offset/limit'}), 400
+    
+    roots, index = build_tree(question.get('answers', []))
+    if parent_id:
+        if parent_id not in index: return jsonify({'success': False, 'message': 'Cavab tapılmadı'}), 404
+        level = index[parent_id]['children']
+    else:
+        level = roots
+    nodes = window(level, offset, limit, REPLY_PAGE_SIZE, REPLY_DEPTH)
+    voter = voter_id(session['user']['email'])
+    voted = {a['id'] for a in question.get('answers', []) if has_voted(a, voter)}
+    html = render_template('Q&A_answers.html', nodes=nodes, question=question, user=session['user'], voted=voted)
+    next_offset = offset + len(nodes)
+    return jsonify({'success': True, 'html': html, 'next_offset': next_offset,
+                    'has_more': next_offset < len(level), 'remaining': max(len(level) - next_offset, 0)})
+
+def find_duplicates(item):
+    """[(similarity, question), ...] best first for a new (unsaved) question"""
+    result = []
+    for score, dup_id in store.view('duplicates').similar(item, threshold=DUPLICATE_THRESHOLD):
+        dup = store.get('qa', dup_id)
+        if dup: result.append((score, dup))
+    return result
+
+@app.route('/api/similar_questions', methods=['POST'])
+def similar_questions():
+    """Questions that look like the one being written (shown in the form before it is posted)"""
+    if 'user' not in session: return jsonify({'success': False}), 401
+    data = request.get_json(silent=True) or {}
+    draft = {'title': (data.get('title') or '')[:255], 'content': data.get('content') or ''}
+    return jsonify({'success': True, 'data': [
+        {'id': dup['id'], 'title': dup.get('title'), 'similarity': round(score, 2)}
+        for score, dup in find_duplicates(draft)]})
 
 @app.route('/api/new_question', methods=['POST'])
 def new_question():
     if 'user' not in session: return jsonify({'success': False}), 401
     data = request.get_json()
-    questions = load_json("qa")
+    # Quill-ə yapışdırılan base64 şəkillər fayla çevrilir, HTML-də yalnız URL qalır
+    content, _ = extract_inline_images(data.get('content'), uploads)
     new_q = {
-        "id": str(uuid.uuid4()), "title": data.get('title'), "content": data.get('content'),
+        "id": str(uuid.uuid4()), "title": data.get('title'), "content": content,
         "category": data.get('category'), "author_email": session['user']['email'],
         "author_name": session['user'].get('name', 'Adsız'), 
         "author_photo": session['user'].get('photo', ''),
+        "tags": normalize_tags(data.get('tags')),
         "timestamp": get_timestamp(), "views": 0, "answers": []
     }
-    questions.insert(0, new_q)
-    save_json("qa", questions)
+    duplicates = find_duplicates(new_q)
+    put_item("qa", new_q)
+
+    reuse_text = None
+    for score, dup in duplicates:
+        if score < AI_REUSE_THRESHOLD: break
+        # Eyni sualın artıq Dastan cavabı varsa, Ollama-nı yenidən çağırma
+        reuse_text = next((a['text'] for a in dup.get('answers', [])
+                           if a.get('author_email') == AI_EMAIL and not a.get('reply_to')), None)
+        if reuse_text: break
 
     # --- AUTO AI ANSWER (ASYNCHRONOUS) ---
     def generate_async_answer(q_id, title, content, category):
         import threading
         def worker():
             try:
-                config = get_ai_config()
-                clean_content = strip_html(content)
-                ai_content = f"Question Title: {title}\nCategory: {category}\nContent: {clean_content}"
-                ai_response_text = get_ai_response(ai_content)
+                if reuse_text:
+                    ai_response_text = reuse_text
+                else:
+                    clean_content = strip_html(content)
+                    ai_content = f"Question Title: {title}\nCategory: {category}\nContent: {clean_content}"
+                    ai_response_text = get_ai_response(ai_content)
                 
                 if ai_response_text:
                     ai_ans = {
                         "id": str(uuid.uuid4()), 
                         "text": ai_response_text,
                         "reply_to": None,
-                        "author_email": "ai@techhub.com", 
+                        "author_email": AI_EMAIL, 
                         "author_name": "Dastan",
                         "author_photo": "/static/images/logo.png",
                         "role": "AI Assistant",
                         "timestamp": get_timestamp() + 1000, 
                         "votes": 0
                     }
-                    current_questions = load_json("qa")
-                    for q in current_questions:
-                        if q['id'] == q_id:
-                            q['answers'].append(ai_ans)
-                            break
-                    save_json("qa", current_questions)
+                    modify_item("qa", q_id, lambda q: q['answers'].append(ai_ans))
             except Exception as e:
                 print(f"⚠️ Auto-answer error: {e}")
         
@@ -374,45 +620,36 @@ def new_question():
 def add_answer():
     if 'user' not in session: return jsonify({'success': False}), 401
     data = request.get_json()
-    questions = load_json("qa")
-    users = load_users()
     user_email = session['user']['email']
+    user_name = session['user']['name']
     q_id = data.get('question_id')
     
-    for q in questions:
-        if q['id'] == q_id:
-            new_ans = {
-                "id": str(uuid.uuid4()), "text": data.get('text'),
-                "reply_to": data.get('reply_to'),
-                "author_email": user_email, "author_name": session['user']['name'],
-                "author_photo": session['user'].get('photo', ''),
-                "role": users[user_email].get('role', 'Yeni'),
-                "timestamp": get_timestamp(), "votes": 0
-            }
-            q['answers'].append(new_ans)
-            break
-    else: return jsonify({'success': False, 'message': 'Sual tapılmadı'}), 404
-    
-    save_json("qa", questions)
+    text, _ = extract_inline_images(data.get('text'), uploads)
+    new_ans = {
+        "id": str(uuid.uuid4()), "text": text,
+        "reply_to": data.get('reply_to'),
+        "author_email": user_email, "author_name": user_name,
+        "author_photo": session['user'].get('photo', ''),
+        "role": (store.get('users', user_email) or {}).get('role', 'Yeni'),
+        "timestamp": get_timestamp(), "votes": 0
+    }
+    q = modify_item("qa", q_id, lambda q: q['answers'].append(new_ans))
+    if not q: return jsonify({'success': False, 'message': 'Sual tapılmadı'}), 404
     
     # --- AUTO AI REPLY (IF MENTIONED OR REPLIED TO) ---
-    ans_text = data.get('text', '')
-    parent_id = data.get('reply_to')
+    ans_text = text or ''
+    parent_id = reply_parent_id(new_ans)
     
     should_reply = "dastan" in ans_text.lower()
     
     if not should_reply and parent_id:
-        for q in questions:
-            for a in q.get('answers', []):
-                if a['id'] == parent_id and a.get('author_email') == "ai@techhub.com":
-                    should_reply = True
-                    break
-            if should_reply: break
+        should_reply = any(a['id'] == parent_id and a.get('author_email') == AI_EMAIL
+                           for a in q.get('answers', []))
 
     if should_reply:
         def worker():
             try:
-                context_q = next((q for q in load_json("qa") if q['id'] == q_id), None)
+                context_q = store.get('qa', q_id)
                 if not context_q: return
                 
                 parent_text = ""
@@ -423,69 +660,175 @@ def add_answer():
                 prompt_context = f"Topic/Question: {context_q['title']}\n"
                 if parent_text:
                     prompt_context += f"You said earlier: {parent_text}\n"
-                prompt_context += f"User ({session['user']['name']}) says: {strip_html(ans_text)}"
+                prompt_context += f"User ({user_name}) says: {strip_html(ans_text)}"
                 
                 ai_response = get_ai_response(prompt_context, system_prompt_override="You are Dastan. A user mentioned you or replied to your comment in a Q&A thread. Provide a short, direct, and helpful reply based on the context.")
                 
                 if ai_response:
                     ai_ans = {
-                        "id": str(uuid.uuid4()), "text": ai_response, "reply_to": new_ans['id'],
-                        "author_email": "ai@techhub.com", "author_name": "Dastan",
+                        "id": str(uuid.uuid4()), "text": ai_response,
+                        "reply_to": {"id": new_ans['id'], "name": user_name},
+                        "author_email": AI_EMAIL, "author_name": "Dastan",
                         "author_photo": "/static/images/logo.png", "role": "AI Assistant",
                         "timestamp": get_timestamp() + 1000, "votes": 0
                     }
-                    curr_q = load_json("qa")
-                    for q in curr_q:
-                        if q['id'] == q_id:
-                            q['answers'].append(ai_ans)
-                            break
-                    save_json("qa", curr_q)
+                    modify_item("qa", q_id, lambda q: q['answers'].append(ai_ans))
             except Exception as e:
                 print(f"❌ Auto-reply error: {e}")
         import threading
         threading.Thread(target=worker, daemon=True).start()
 
-    user = users[user_email]
-    user['answerCount'] = user.get('answerCount', 0) + 1
-    user['role'] = update_role_logic(user)
-    save_users(users)
-    session['user'] = user
-    return jsonify({'success': True, 'new_role': user['role']})
+    def reward(user):
+        user['answerCount'] = user.get('answerCount', 0) + 1
+        user['role'] = update_role_logic(user)
+    
+    user = modify_item("users", user_email, reward, defer=True)
+    if user: session['user'] = user
+    return jsonify({'success': True, 'new_role': session['user'].get('role', 'Yeni')})
 
-@app.route('/api/get_filtered_questions', methods=['POST'])
+@app.route('/api/get_filtered_questions', methods=['GET', 'POST'])
 def get_filtered_questions():
-    data = request.get_json()
+    data = request.args if request.method == 'GET' else (request.get_json(silent=True) or {})
     filter_type = data.get('filter', 'categories')
-    page = int(data.get('page', 1))
-    limit, skip = 10, (page - 1) * 10
-    all_questions = load_json("qa")
-    filtered_data = []
-    if filter_type == 'populyar':
-        filtered_data = sorted(all_questions, key=lambda x: x.get('votes', 0), reverse=True)
-    elif filter_type == 'cavabsiz':
-        filtered_data = [q for q in all_questions if len(q.get('answers', [])) == 0]
-        filtered_data.sort(key=lambda x: x['timestamp'], reverse=True)
-    elif filter_type == 'yeni-sorgu':
-        filtered_data = sorted(all_questions, key=lambda x: x['timestamp'], reverse=True)
-    
-    total = len(filtered_data)
-    paginated = filtered_data[skip: skip + limit]
-    return jsonify({'success': True, 'data': paginated, 'has_more': (skip + limit) < total})
+    category = data.get('category')
+    limit = 10
+    if category:
+        if category not in QA_CATEGORIES: return jsonify({'success': False, 'message': 'Kategoriya tapılmadı'}), 404
+        filter_type = 'kateqoriya'
+    elif filter_type not in ('populyar', 'cavabsiz', 'yeni-sorgu'):
+        return jsonify({'success': True, 'data': [], 'has_more': False, 'next_cursor': None})
+    
+    view = store.view(filter_type)
+    cursor = data.get('cursor')
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Yanlış cursor'}), 400
+    
+    def build():
+        paginated, next_position = view.page(position, limit, partition=category)
+        next_cursor = encode_cursor(next_position) if next_position else None
+        return {'success': True, 'data': paginated, 'has_more': next_cursor is not None, 'next_cursor': next_cursor}
+    
+    try:
+        if request.method == 'GET':
+            return conditional_json(version_etag(store, 'qa'), build, store.last_modified('qa'))
+        return jsonify(build())
+    except TypeError:
+        return jsonify({'success': False, 'message': 'Yanlış cursor'}), 400
+
+@app.route('/api/search')
+def search_questions():
+    query = request.args.get('q', '').strip()
+    category = request.args.get('category') or None
+    if category and category not in QA_CATEGORIES: return jsonify({'success': False, 'message': 'Kategoriya tapılmadı'}), 404
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Yanlış limit/offset'}), 400
+    
+    started = time.perf_counter()
+    total, hits = store.view('search').search(query, category=category, limit=limit, offset=offset)
+    results = []
+    for score, q_id in hits:
+        q = store.get('qa', q_id)
+        if not q: continue
+        results.append({
+            'id': q['id'], 'title': q.get('title'), 'category': q.get('category'),
+            'author_name': q.get('author_name'), 'timestamp': q.get('timestamp'),
+            'answer_count': len(q.get('answers', [])), 'score': round(score, 4)
+        })
+    took_ms = round((time.perf_counter() - started) * 1000, 2)
+    return jsonify({'success': True, 'data': results, 'total': total,
+                    'has_more': offset + len(hits) < total, 'took_ms': took_ms})
+
+@app.route('/api/autocomplete')
+def autocomplete_titles():
+    prefix = request.args.get('q', '')
+    category = request.args.get('category') or None
+    if category and category not in QA_CATEGORIES: return jsonify({'success': False, 'message': 'Kategoriya tapılmadı'}), 404
+    try:
+        limit = min(max(int(request.args.get('limit', 8)), 1), 20)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Yanlış limit'}), 400
+    matches = store.view('autocomplete').complete(prefix[:255], category=category, limit=limit)
+    return jsonify({'success': True, 'data': [{'id': q_id, 'title': title} for q_id, title in matches]})
+
+@app.route('/api/tags')
+def list_tags():
+    category = request.args.get('category') or None
+    if category and category not in QA_CATEGORIES: return jsonify({'success': False, 'message': 'Kategoriya tapılmadı'}), 404
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Yanlış limit'}), 400
+    facets = store.view('tags').facets(category=category, limit=limit)
+    return jsonify({'success': True, 'tags': [{'tag': tag, 'count': count} for tag, count in facets['tags']],
+                    'categories': facets['categories']})
+
+@app.route('/api/tags/<tag>/questions')
+def questions_by_tag(tag):
+    category = request.args.get('category') or None
+    if category and category not in QA_CATEGORIES: return jsonify({'success': False, 'message': 'Kategoriya tapılmadı'}), 404
+    tag = (normalize_tags([tag]) or [''])[0]
+    cursor = request.args.get('cursor')
+    tag_index = store.view('tags')
+    try:
+        position = decode_cursor(cursor) if cursor else None
+        q_ids, next_position = tag_index.page(tag, category=category, cursor=position, limit=10)
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'message': 'Yanlış cursor'}), 400
+    questions = [q for q in (store.get('qa', q_id) for q_id in q_ids) if q]
+    next_cursor = encode_cursor(next_position) if next_position else None
+    return jsonify({'success': True, 'data': questions, 'total': tag_index.count(tag, category),
+                    'has_more': next_cursor is not None, 'next_cursor': next_cursor})
+
+def cast_vote(on):
+    if 'user' not in session: return jsonify({'success': False, 'message': 'Giriş edilməyib'}), 401
+    data = request.get_json() or {}
+    q_id, ans_id = data.get('question_id'), data.get('answer_id')
+    email = session['user']['email']
+    voter = voter_id(email)
+    
+    def change(txn):
+        q = txn.get(q_id)
+        if q is None: return None
+        target = q if not ans_id else next((a for a in q.get('answers', []) if a.get('id') == ans_id), None)
+        if target is None: return None
+        if target.get('author_email') == email: return 'own'
+        if set_vote(target, voter, on):
+            txn.put(q, q_id)
+        return target.get('votes', 0)
+    
+    try:
+        result = store.update('qa', change)
+    except Exception as e:
+        print(f"❌ Vote Error: {e}")
+        return jsonify({'success': False, 'message': 'Səs qeydə alınmadı'}), 500
+    if result is None: return jsonify({'success': False, 'message': 'Tapılmadı'}), 404
+    if result == 'own': return jsonify({'success': False, 'message': 'Öz yazınıza səs verə bilməzsiniz'}), 403
+    return jsonify({'success': True, 'votes': result, 'voted': on})
+
+@app.route('/api/vote', methods=['POST'])
+def vote():
+    return cast_vote(True)
+
+@app.route('/api/unvote', methods=['POST'])
+def unvote():
+    return cast_vote(False)
 
 @app.route('/api/delete_question', methods=['POST'])
 def delete_question():
     if 'user' not in session: return jsonify({'success': False, 'message': 'Giriş edilməyib'}), 401
     data = request.get_json()
     q_id = data.get('id')
-    questions = load_json("qa")
-    users = load_users()
     current_user = session['user']
-    user_role = users.get(current_user['email'], {}).get('role', 'Yeni')
-    q_to_delete = next((q for q in questions if q['id'] == q_id), None)
+    user_role = (store.get('users', current_user['email']) or {}).get('role', 'Yeni')
+    q_to_delete = store.get('qa', q_id)
     if not q_to_delete: return jsonify({'success': False, 'message': 'Sual tapılmadı'}), 404
-    if current_user['email'] == q_to_delete['author_email'] or user_role in ['Moderator', 'Administrator', 'Staff']:
-        questions = [q for q in questions if q['id'] != q_id]
-        save_json("qa", questions)
+    if current_user['email'] == q_to_delete['author_email'] or user_role in MODERATOR_ROLES:
+        delete_item("qa", q_id)
         return jsonify({'success': True})
     return jsonify({'success': False, 'message': 'İcazəniz yoxdur'}), 403
 
@@ -494,17 +837,15 @@ def delete_answer():
     if 'user' not in session: return jsonify({'success': False}), 401
     data = request.get_json()
     q_id, ans_id = data.get('question_id'), data.get('answer_id')
-    questions = load_json("qa")
-    users = load_users()
     current_user = session['user']
-    user_role = users.get(current_user['email'], {}).get('role', 'Yeni')
-    question = next((q for q in questions if q['id'] == q_id), None)
+    user_role = (store.get('users', current_user['email']) or {}).get('role', 'Yeni')
+    question = store.get('qa', q_id)
     if not question: return jsonify({'success': False}), 404
     answer = next((a for a in question['answers'] if a['id'] == ans_id), None)
     if not answer: return jsonify({'success': False}), 404
-    if current_user['email'] == answer['author_email'] or user_role in ['Moderator', 'Administrator', 'Staff']:
-        question['answers'] = [a for a in question['answers'] if a['id'] != ans_id]
-        save_json("qa", questions)
+    if current_user['email'] == answer['author_email'] or user_role in MODERATOR_ROLES:
+        def remove(q): q['answers'] = [a for a in q['answers'] if a['id'] != ans_id]
+        modify_item("qa", q_id, remove)
         return jsonify({'success': True})
     return jsonify({'success': False, 'message': 'İcazəniz yoxdur'}), 403
 
@@ -514,10 +855,14 @@ def upload_image():
     if 'image' not in request.files: return jsonify({'success': False}), 400
     file = request.files['image']
     if file.filename == '': return jsonify({'success': False}), 400
-    filename = secure_filename(str(uuid.uuid4()) + "_" + file.filename)
-    save_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(save_path)
-    return jsonify({'success': True, 'url': f'../static/images/uploads/{filename}'})
+    ext = normalize_extension(file.filename)
+    if not ext: return jsonify({'success': False, 'message': 'Yalnız şəkil faylları yüklənə bilər'}), 400
+    name, _ = uploads.save(file.stream, ext)
+    return jsonify({'success': True, 'url': uploads.url(name)})
+
+@app.route('/uploads/<name>')
+def serve_upload(name):
+    return uploads.send(name)
 
 # --- 🔗 GITHUB INTEGRATION ---
 
@@ -526,9 +871,8 @@ def github_settings():
     if 'user' not in session:
         return redirect(url_for('home'))
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     github_connected = user.get('github_token') is not None
     github_username = user.get('github_username', '')
@@ -555,14 +899,14 @@ def save_github_token():
         github_username = user.login
         
         # Kullanıcı bilgilerini güncelle
-        users = load_users()
         user_email = session['user']['email']
+        encrypted = encrypt_token(token)
         
-        users[user_email]['github_token'] = encrypt_token(token)
-        users[user_email]['github_username'] = github_username
-        
-        save_users(users)
-        session['user'] = users[user_email]
+        updated = modify_item("users", user_email, lambda u: u.update(
+            github_token=encrypted, github_username=github_username))
+        if not updated:
+            return jsonify({'success': False, 'message': 'Kullanıcı bulunamadı'}), 404
+        session['user'] = updated
         
         return jsonify({
             'success': True,
@@ -581,14 +925,13 @@ def remove_github_token():
     if 'user' not in session:
         return jsonify({'success': False}), 401
     
-    users = load_users()
     user_email = session['user']['email']
     
-    users[user_email]['github_token'] = None
-    users[user_email]['github_username'] = None
-    
-    save_users(users)
-    session['user'] = users[user_email]
+    updated = modify_item("users", user_email, lambda u: u.update(
+        github_token=None, github_username=None))
+    if not updated:
+        return jsonify({'success': False, 'message': 'Kullanıcı bulunamadı'}), 404
+    session['user'] = updated
     
     return jsonify({'success': True, 'message': 'GitHub bağlantısı kaldırıldı'})
 
@@ -597,9 +940,8 @@ def get_github_repos():
     if 'user' not in session:
         return jsonify({'success': False, 'message': 'Giriş yapmalısınız'}), 401
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     encrypted_token = user.get('github_token')
     if not encrypted_token:
@@ -615,8 +957,7 @@ def get_github_repos():
         repos = gh_user.get_repos()
         
         # Mevcut projeleri al (hangisi zaten import edilmiş)
-        projects = load_projects()
-        imported_repos = {p.get('github_repo') for p in projects if p.get('author_email') == user_email}
+        imported_repos = {p.get('github_repo') for p in store.find('projects', 'author_email', user_email)}
         
         repo_list = []
         for repo in repos:
@@ -647,9 +988,8 @@ def import_from_github():
     data = request.get_json()
     repo_full_name = data.get('repo_full_name')
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     encrypted_token = user.get('github_token')
     if not encrypted_token:
@@ -661,9 +1001,6 @@ def import_from_github():
         g = Github(token)
         repo = g.get_repo(repo_full_name)
         
-        # Proje listesini yükle
-        projects = load_projects()
-        
         # Yeni proje oluştur
         new_project = {
             'id': str(uuid.uuid4()),
@@ -681,8 +1018,7 @@ def import_from_github():
             'synced': True
         }
         
-        projects.append(new_project)
-        save_projects(projects)
+        put_item("projects", new_project)
         
         return jsonify({
             'success': True,
@@ -702,9 +1038,8 @@ def push_to_github():
     repo_name = data.get('repo_name')
     is_private = data.get('is_private', False)
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     encrypted_token = user.get('github_token')
     if not encrypted_token:
@@ -713,8 +1048,7 @@ def push_to_github():
     token = decrypt_token(encrypted_token)
     
     # Projeyi bul
-    projects = load_projects()
-    project = next((p for p in projects if p['id'] == project_id), None)
+    project = store.get('projects', project_id)
     if not project:
         return jsonify({'success': False, 'message': 'Proje bulunamadı'}), 404
     
@@ -752,14 +1086,9 @@ def push_to_github():
         )
         
         # Projeyi güncelle
-        for p in projects:
-            if p['id'] == project_id:
-                p['github_url'] = repo.html_url
-                p['github_repo'] = repo.full_name
-                p['synced'] = True
-                break
-        
-        save_projects(projects)
+        if not modify_item("projects", project_id, lambda p: p.update(
+                github_url=repo.html_url, github_repo=repo.full_name, synced=True)):
+            return jsonify({'success': False, 'message': 'Proje güncellenemedi'}), 500
         
         return jsonify({
             'success': True,
@@ -775,9 +1104,8 @@ def sync_from_github(project_id):
     if 'user' not in session:
         return jsonify({'success': False}), 401
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     encrypted_token = user.get('github_token')
     if not encrypted_token:
@@ -785,8 +1113,7 @@ def sync_from_github(project_id):
     
     token = decrypt_token(encrypted_token)
     
-    projects = load_projects()
-    project = next((p for p in projects if p['id'] == project_id), None)
+    project = store.get('projects', project_id)
     if not project:
         return jsonify({'success': False, 'message': 'Proje bulunamadı'}), 404
     
@@ -799,15 +1126,13 @@ def sync_from_github(project_id):
         repo = g.get_repo(github_repo)
         
         # Projeyi güncelle
-        for p in projects:
-            if p['id'] == project_id:
-                p['title'] = repo.name
-                p['description'] = repo.description or p.get('description', '')
-                p['tech_stack'] = repo.language or p.get('tech_stack', 'Unknown')
-                p['stars'] = repo.stargazers_count
-                break
-        
-        save_projects(projects)
+        def apply_repo(p):
+            p['title'] = repo.name
+            p['description'] = repo.description or p.get('description', '')
+            p['tech_stack'] = repo.language or p.get('tech_stack', 'Unknown')
+            p['stars'] = repo.stargazers_count
+        if not modify_item("projects", project_id, apply_repo):
+            return jsonify({'success': False, 'message': 'Proje güncellenemedi'}), 500
         
         return jsonify({
             'success': True,
@@ -824,8 +1149,7 @@ def github_projects():
         return redirect(url_for('home'))
     
     # Get all projects synced from GitHub (from all users)
-    projects = load_projects()
-    github_projects = [p for p in projects if p.get('synced')]  # Just check if synced is truthy
+    github_projects = store.find('projects', 'synced', True)
     
     # Sort by timestamp (newest first)
     github_projects.sort(key=lambda x: x.get('timestamp', 0), reverse=True)
@@ -838,9 +1162,8 @@ def get_repo_contents(repo_full_name):
     if 'user' not in session:
         return jsonify({'success': False, 'message': 'Giriş yapmalısınız'}), 401
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     encrypted_token = user.get('github_token')
     if not encrypted_token:
@@ -882,9 +1205,8 @@ def get_repo_file(repo_full_name):
     if 'user' not in session:
         return jsonify({'success': False, 'message': 'Giriş yapmalısınız'}), 401
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     encrypted_token = user.get('github_token')
     if not encrypted_token:
@@ -934,9 +1256,8 @@ def create_github_project():
     if not repo_name:
         return jsonify({'success': False, 'message': 'Repository name is required'}), 400
     
-    users = load_users()
     user_email = session['user']['email']
-    user = users.get(user_email, {})
+    user = store.get('users', user_email) or {}
     
     encrypted_token = user.get('github_token')
     if not encrypted_token:
@@ -983,8 +1304,6 @@ def create_github_project():
             pass
         
         # Save project to local database
-        projects = load_projects()
-        
         new_project = {
             'id': str(uuid.uuid4()),
             'title': repo_name,
@@ -1001,8 +1320,7 @@ def create_github_project():
             'synced': True
         }
         
-        projects.append(new_project)
-        save_projects(projects)
+        put_item("projects", new_project)
         
         return jsonify({
             'success': True,
@@ -1027,16 +1345,8 @@ def delete_github_project(project_id):
     data = request.get_json() or {}
     delete_from_github = data.get('delete_from_github', False)
     
-    projects = load_projects()
-    project = None
-    project_index = None
-    
     # Find the project
-    for i, p in enumerate(projects):
-        if p.get('id') == project_id:
-            project = p
-            project_index = i
-            break
+    project = store.get('projects', project_id)
     
     if not project:
         return jsonify({'success': False, 'message': 'Project not found'}), 404
@@ -1049,9 +1359,8 @@ def delete_github_project(project_id):
     
     # Delete from GitHub if requested
     if delete_from_github and project.get('github_repo'):
-        users = load_users()
         user_email = session['user']['email']
-        user = users.get(user_email, {})
+        user = store.get('users', user_email) or {}
         encrypted_token = user.get('github_token')
         
         if encrypted_token:
@@ -1083,8 +1392,7 @@ def delete_github_project(project_id):
                 github_delete_error = f'Error deleting from GitHub: {str(e)}'
     
     # Remove from database even if GitHub deletion failed
-    projects.pop(project_index)
-    save_projects(projects)
+    delete_item("projects", project_id)
     
     # Return appropriate message
     if github_delete_error:
@@ -1121,12 +1429,7 @@ def upload_code_to_github():
             return jsonify({'success': False, 'message': 'No file selected'}), 400
         
         # Find project
-        projects = load_projects()
-        project = None
-        for p in projects:
-            if p.get('id') == project_id:
-                project = p
-                break
+        project = store.get('projects', project_id)
         
         if not project:
             return jsonify({'success': False, 'message': 'Project not found'}), 404
@@ -1139,9 +1442,8 @@ def upload_code_to_github():
             return jsonify({'success': False, 'message': 'Project not connected to GitHub'}), 400
         
         # Get GitHub token
-        users = load_users()
         user_email = session['user']['email']
-        user = users.get(user_email, {})
+        user = store.get('users', user_email) or {}
         encrypted_token = user.get('github_token')
         
         if not encrypted_token:
@@ -1752,42 +2054,49 @@ def chat_stream():
 @app.route('/update_profile', methods=['POST'])
 def update_profile():
     if 'user' not in session: return jsonify({'success': False}), 401
-    users = load_users()
-    user_data = users.get(session['user']['email'])
+    user_data = store.get('users', session['user']['email'])
     if not user_data: return jsonify({'success': False}), 404
+    changes = {}
     
-    if location := request.form.get('location'): user_data['location'] = location
-    if about := request.form.get('about'): user_data['about'] = about
+    if location := request.form.get('location'): changes['location'] = location
+    if about := request.form.get('about'): changes['about'] = about
     
-    if phone := request.form.get('phone'): user_data['phone'] = phone
-    if website := request.form.get('website'): user_data['website'] = website
+    if phone := request.form.get('phone'): changes['phone'] = phone
+    if website := request.form.get('website'): changes['website'] = website
     
-    if github := request.form.get('github'): user_data['github'] = github
-    if linkedin := request.form.get('linkedin'): user_data['linkedin'] = linkedin
-    if twitter := request.form.get('twitter'): user_data['twitter'] = twitter
-    if instagram := request.form.get('instagram'): user_data['instagram'] = instagram
+    if github := request.form.get('github'): changes['github'] = github
+    if linkedin := request.form.get('linkedin'): changes['linkedin'] = linkedin
+    if twitter := request.form.get('twitter'): changes['twitter'] = twitter
+    if instagram := request.form.get('instagram'): changes['instagram'] = instagram
     
     old_p, new_p, conf_p = request.form.get('old_password'), request.form.get('new_password'), request.form.get('confirm_password')
     if new_p:
-        if user_data['password'] == old_p and new_p == conf_p: user_data['password'] = new_p
+        if user_data['password'] == old_p and new_p == conf_p: changes['password'] = new_p
         else: return jsonify({'success': False, 'message': 'Şifrə xətası'}), 400
 
     if 'profile_photo' in request.files:
         file = request.files['profile_photo']
         if file.filename:
-            filename = secure_filename(f"{user_data['name']}_profile_{str(uuid.uuid4())[:8]}{os.path.splitext(file.filename)[1]}")
-            file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-            user_data['photo'] = f"/static/images/uploads/{filename}"
+            ext = normalize_extension(file.filename)
+            if not ext: return jsonify({'success': False, 'message': 'Yalnız şəkil faylları yüklənə bilər'}), 400
+            name, _ = uploads.save(file.stream, ext)
+            try:
+                make_avatar_variants(uploads, name)
+            except Exception as e:
+                # Original photo is still used; only the small copies are missing
+                print(f"❌ Avatar thumbnail error ({name}): {e}")
+            changes['photo'] = uploads.url(name)
 
     if 'banner_photo' in request.files:
         file = request.files['banner_photo']
         if file.filename:
-            filename = secure_filename(f"{user_data['name']}_banner_{str(uuid.uuid4())[:8]}{os.path.splitext(file.filename)[1]}")
-            file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-            user_data['banner'] = f"/static/images/uploads/{filename}"
+            ext = normalize_extension(file.filename)
+            if not ext: return jsonify({'success': False, 'message': 'Yalnız şəkil faylları yüklənə bilər'}), 400
+            name, _ = uploads.save(file.stream, ext)
+            changes['banner'] = uploads.url(name)
 
-    users[user_data['email']] = user_data
-    save_users(users)
+    user_data = modify_item("users", user_data['email'], lambda u: u.update(changes))
+    if not user_data: return jsonify({'success': False}), 404
     session['user'] = user_data
     return jsonify({'success': True})
 
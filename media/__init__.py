@@ -0,0 +1,4 @@
+from .uploads import UploadStore, normalize_extension, IMAGE_EXTENSIONS
+from .gc import UploadCollector, upload_refs
+from .thumbnails import make_avatar_variants, AVATAR_SIZES
+from .inline_images import extract_inline_images, extract_question_images
@@ -0,0 +1,121 @@
+import os
+import re
+import time
+import shutil
+import threading
+
+from .uploads import TMP_PREFIX
+
+# File name after ".../uploads/" in a URL or inside HTML (src="/uploads/<sha>.png")
+_UPLOAD_REF = re.compile(r'uploads/([^\s"\'<>()?#\\/]+)')
+
+
+def _blob_hash(name):
+    head = name.split('.', 1)[0].split('_', 1)[0]
+    return head if len(head) == 64 else None
+
+
+def upload_refs(value, found):
+    """Add every upload file name mentioned in a (nested) JSON value to found"""
+    if isinstance(value, str):
+        if 'uploads/' in value:
+            found.update(_UPLOAD_REF.findall(value))
+    elif isinstance(value, dict):
+        for v in value.values():
+            upload_refs(v, found)
+    elif isinstance(value, list):
+        for v in value:
+            upload_refs(v, found)
+    return found
+
+
+class UploadCollector:
+    """Mark-and-sweep garbage collection for the upload folder.
+
+    mark() streams every collection of the store (or only `collections`
+    when given) and collects every upload its entities reference, so a
+    new field holding an upload path is covered without changes here;
+    sweep() deletes - or moves to `quarantine` - the files nobody
+    references. Files modified within
+    `grace` seconds are always kept: an upload whose question hasn't been
+    saved yet is unreferenced for a moment, and UploadStore touches a blob
+    each time it is reused.
+    """
+
+    def __init__(self, store, root, collections=None, grace=7 * 24 * 3600,
+                 quarantine=None, interval=24 * 3600):
+        self.store = store
+        self.root = root
+        self.collections = collections
+        self.grace = grace
+        self.quarantine = quarantine
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def mark(self):
+        """(referenced file names, number of entities scanned)"""
+        found, entities = set(), 0
+        for collection in self.collections or self.store.collections():
+            for _, item in self.store.iter_items(collection):
+                upload_refs(item, found)
+                entities += 1
+        return found, entities
+
+    def sweep(self, referenced, dry_run=False):
+        report = {'scanned': 0, 'referenced': 0, 'removed': 0, 'bytes': 0}
+        cutoff = time.time() - self.grace
+        # Thumbnails (<sha256>_<size>.webp) live as long as the blob they were made from
+        sources = {_blob_hash(name) for name in referenced} - {None}
+        for entry in os.scandir(self.root):
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            report['scanned'] += 1
+            name = entry.name
+            if not name.startswith(TMP_PREFIX) and (name in referenced or _blob_hash(name) in sources):
+                report['referenced'] += 1
+                continue
+            st = entry.stat(follow_symlinks=False)
+            if st.st_mtime > cutoff:
+                continue
+            if not dry_run:
+                try:
+                    if self.quarantine:
+                        os.makedirs(self.quarantine, exist_ok=True)
+                        shutil.move(entry.path, os.path.join(self.quarantine, entry.name))
+                    else:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+            report['removed'] += 1
+            report['bytes'] += st.st_size
+        return report
+
+    def run_once(self, dry_run=False):
+        """One mark + sweep; returns {'scanned', 'referenced', 'removed', 'bytes'}"""
+        referenced, entities = self.mark()
+        if not entities:
+            # Missing or unreadable data files would make every upload look orphaned
+            print("⚠️ Uploads GC: no stored entities found, skipping sweep")
+            return {'scanned': 0, 'referenced': 0, 'removed': 0, 'bytes': 0}
+        report = self.sweep(referenced, dry_run)
+        action = 'would remove' if dry_run else ('quarantined' if self.quarantine else 'removed')
+        print(f"🧹 Uploads GC: {action} {report['removed']} of {report['scanned']} files, "
+              f"{report['bytes'] / 1024:.1f} KB {'reclaimable' if dry_run else 'reclaimed'}")
+        return report
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"❌ Uploads GC error: {e}")
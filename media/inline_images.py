@@ -0,0 +1,120 @@
+"""Move data: URI images out of Q&A HTML into the upload store.
+
+    python -m media.inline_images [--backend json|journal|sqlite|sharded] [--static static]
+
+Quill embeds pasted images as <img src="data:image/png;base64,...">, which
+then sits inside techhub_qa_db.json and every response that carries the
+HTML. new_question/add_answer call extract_inline_images() on new content;
+this command does the same once for what is already stored. Run it while
+the server is stopped.
+"""
+import os
+import re
+import sys
+import copy
+import base64
+import binascii
+import argparse
+
+from storage import DocumentStore, JsonFileBackend, JournalBackend, SqliteBackend, ShardedBackend
+from storage.migrate import FILES
+from storage.ops import item_key
+
+from .uploads import UploadStore
+
+# Raster formats only: an SVG could carry script, so it is left where it is
+MIME_EXTENSIONS = {
+    'png': '.png', 'jpeg': '.jpg', 'jpg': '.jpg', 'gif': '.gif', 'webp': '.webp',
+    'bmp': '.bmp', 'x-icon': '.ico', 'vnd.microsoft.icon': '.ico',
+}
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+_DATA_URI_SRC = re.compile(
+    r'(\bsrc\s*=\s*)(["\'])data:image/([a-z0-9.+-]+);base64,([A-Za-z0-9+/=\s]+)\2', re.I)
+
+
+def extract_inline_images(html, uploads):
+    """Store every base64 <img> source in html; returns (new html, number of images moved)"""
+    if not html or 'data:image' not in html:
+        return html, 0
+    moved = 0
+
+    def replace(match):
+        nonlocal moved
+        ext = MIME_EXTENSIONS.get(match.group(3).lower())
+        payload = re.sub(r'\s+', '', match.group(4))
+        if not ext or len(payload) * 3 // 4 > MAX_IMAGE_BYTES:
+            return match.group(0)
+        try:
+            data = base64.b64decode(payload, validate=True)
+        except (binascii.Error, ValueError):
+            return match.group(0)
+        name, _ = uploads.save_bytes(data, ext)
+        moved += 1
+        return f'{match.group(1)}{match.group(2)}{uploads.url(name)}{match.group(2)}'
+
+    return _DATA_URI_SRC.sub(replace, html), moved
+
+
+def extract_question_images(question, uploads):
+    """Rewrite a question's content and its answers in place; returns images moved"""
+    question['content'], moved = extract_inline_images(question.get('content'), uploads)
+    for answer in question.get('answers', []):
+        answer['text'], n = extract_inline_images(answer.get('text'), uploads)
+        moved += n
+    return moved
+
+
+def has_inline_images(question):
+    texts = [question.get('content')] + [a.get('text') for a in question.get('answers', [])]
+    return any(text and 'data:image' in text for text in texts)
+
+
+def migrate(store, uploads):
+    """Extract inline images from every stored question; returns (questions changed, images moved)"""
+    if store.backend_writes_entities('qa'):
+        items = store.iter_items('qa')
+    else:
+        # A whole-file backend rewrites the file we would be streaming from; it has to be loaded anyway
+        items = [(item_key('qa', q), q) for q in store.load('qa')]
+    questions = images = 0
+    for key, question in items:
+        if not has_inline_images(question):
+            continue
+        question = copy.deepcopy(question)
+        moved = extract_question_images(question, uploads)
+        if moved:
+            store.put('qa', question, key, defer=True)
+            questions += 1
+            images += moved
+    store.flush()
+    return questions, images
+
+
+def _open_store(args):
+    paths = {collection: os.path.join(args.static, filename) for collection, filename in FILES.items()}
+    if args.backend == 'journal':
+        return DocumentStore(JournalBackend(paths))
+    if args.backend == 'sqlite':
+        return DocumentStore(SqliteBackend(args.db))
+    if args.backend == 'sharded':
+        return DocumentStore(ShardedBackend(args.dest))
+    return DocumentStore(JsonFileBackend(paths))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Move inline base64 images from Q&A HTML into the upload store')
+    parser.add_argument('--backend', choices=['json', 'journal', 'sqlite', 'sharded'],
+                        default=os.environ.get('TECHHUB_STORAGE', 'json'))
+    parser.add_argument('--static', default='static')
+    parser.add_argument('--db', default=os.environ.get('TECHHUB_SQLITE_PATH', os.path.join('static', 'techhub.sqlite3')))
+    parser.add_argument('--dest', default=os.environ.get('TECHHUB_SHARD_DIR', os.path.join('static', 'techhub_db')))
+    parser.add_argument('--uploads', default=os.path.join('static', 'images', 'uploads'))
+    args = parser.parse_args(argv)
+    questions, images = migrate(_open_store(args), UploadStore(args.uploads))
+    print(f"✅ {images} inline images moved to {args.uploads} from {questions} questions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
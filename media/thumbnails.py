@@ -0,0 +1,38 @@
+import io
+import os
+
+from PIL import Image, ImageOps
+
+AVATAR_SIZES = (32, 64, 256)
+
+
+def _square(image):
+    """Centre crop to a square (avatars are shown as circles)"""
+    width, height = image.size
+    side = min(width, height)
+    left, top = (width - side) // 2, (height - side) // 2
+    return image.crop((left, top, left + side, top + side))
+
+
+def make_avatar_variants(uploads, name, sizes=AVATAR_SIZES, quality=82):
+    """Write square WebP copies of an uploaded avatar next to it.
+
+    Variant names are derived from the source blob (<sha256>_<size>.webp),
+    so they are as immutable as the source and avatar_url() can find them
+    from the photo URL alone. Returns {size: name}; sizes larger than the
+    source are encoded at the source size.
+    """
+    with Image.open(uploads.path(name)) as image:
+        image = _square(ImageOps.exif_transpose(image))
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        variants = {}
+        for size in sizes:
+            variant = uploads.variant_name(name, size)
+            path = uploads.path(variant)
+            if not os.path.exists(path):
+                side = min(size, image.width)
+                buf = io.BytesIO()
+                image.resize((side, side), Image.LANCZOS).save(buf, 'WEBP', quality=quality, method=4)
+                uploads.write_derived(variant, buf.getvalue())
+            variants[size] = variant
+    return variants
@@ -0,0 +1,129 @@
+import os
+import re
+import hashlib
+import tempfile
+
+from flask import send_from_directory, abort
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.bmp'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+TMP_PREFIX = '.tmp_'
+
+_BLOB_NAME = re.compile(r'[0-9a-f]{64}(?:_\d{1,4})?\.[a-z0-9]{1,5}')
+VARIANT_EXTENSION = '.webp'
+
+
+def normalize_extension(filename):
+    """Lower-cased image extension of an uploaded file name, None if it isn't an image"""
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext == '.jpeg':
+        ext = '.jpg'
+    return ext if ext in IMAGE_EXTENSIONS else None
+
+
+class UploadStore:
+    """Uploaded files stored under the SHA-256 of their content.
+
+    save() streams the upload into a temp file while hashing it, then
+    renames it to <sha256><ext>. If a blob with that hash already exists
+    the temp file is dropped and the existing one is reused, so uploading
+    the same avatar ten times keeps one file. Blob names never change
+    content, which is what makes immutable caching safe.
+    """
+
+    def __init__(self, root, url_prefix='/uploads', chunk_size=64 * 1024):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip('/')
+        self.chunk_size = chunk_size
+        os.makedirs(root, exist_ok=True)
+
+    def url(self, name):
+        return f'{self.url_prefix}/{name}'
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def name_from_url(self, url):
+        """Blob name of one of our URLs (leading '..' tolerated), None for anything else"""
+        if not url:
+            return None
+        prefix = self.url_prefix + '/'
+        url = url[2:] if url.startswith('..') else url
+        if not url.startswith(prefix):
+            return None
+        name = url[len(prefix):]
+        return name if self.is_blob(name) else None
+
+    def variant_name(self, name, size):
+        """Name of a resized copy of blob `name` (see media.thumbnails)"""
+        return f'{name.split(".", 1)[0].split("_", 1)[0]}_{size}{VARIANT_EXTENSION}'
+
+    def variant_url(self, url, size):
+        """URL of the size variant of an uploaded image if it exists, else url itself"""
+        name = self.name_from_url(url)
+        if name:
+            variant = self.variant_name(name, size)
+            if os.path.exists(self.path(variant)):
+                return self.url(variant)
+        return url
+
+    def is_blob(self, name):
+        return bool(_BLOB_NAME.fullmatch(name))
+
+    def save(self, stream, ext):
+        """Store a binary stream; returns (name, created)"""
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=TMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while chunk := stream.read(self.chunk_size):
+                    digest.update(chunk)
+                    f.write(chunk)
+            return self._commit(tmp_path, digest.hexdigest() + ext)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save_bytes(self, data, ext):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=TMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return self._commit(tmp_path, hashlib.sha256(data).hexdigest() + ext)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def write_derived(self, name, data):
+        """Atomically write a file derived from a blob (e.g. a thumbnail) under its own name"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=TMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path(name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _commit(self, tmp_path, name):
+        target = self.path(name)
+        if os.path.exists(target):
+            os.remove(tmp_path)
+            # Touch it: the blob has just been used again
+            os.utime(target)
+            return name, False
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, target)
+        return name, True
+
+    def send(self, name):
+        """Response for GET <url_prefix>/<name> with far-future caching"""
+        if not self.is_blob(name) or not os.path.isfile(self.path(name)):
+            abort(404)
+        response = send_from_directory(self.root, name, etag=False)
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
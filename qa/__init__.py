@@ -0,0 +1,8 @@
+from .text import tokenize, words, fold
+from .search import SearchIndex
+from .autocomplete import TitleAutocomplete
+from .duplicates import DuplicateIndex
+from .tags import TagIndex, normalize_tags
+from .counters import ViewCounter
+from .votes import hot_score, voter_id, has_voted, set_vote
+from .threads import reply_parent_id, build_tree, window
@@ -0,0 +1,120 @@
+import threading
+
+from storage import StoreListener
+from storage.ops import item_key
+
+from .text import words
+
+
+class TitleAutocomplete(StoreListener):
+    """Sorted-array prefix index over question titles.
+
+    Every title is indexed under each of its word starts ("goroutine leak"
+    is found by "gor" and by "lea"). The array holds (key, offset) pairs
+    sorted by the normalized title from that offset on, so each title's
+    text is stored once; suffixes are only sliced while comparing. One
+    array serves every category, which complete() filters on the fly.
+    complete() is a binary search plus a short forward scan, and a new or
+    deleted question touches only its own entries.
+    """
+
+    def __init__(self, collection='qa', max_scan=200, max_visit=5000):
+        self.collection = collection
+        self.max_scan = max_scan
+        self.max_visit = max_visit
+        self._lock = threading.Lock()
+        self._array = []
+        self._docs = {}
+
+    def _suffix(self, entry):
+        key, offset = entry
+        return self._docs[key][2][offset:]
+
+    def _bisect(self, text, key=None):
+        """First position whose (suffix, key) is not below (text, key)"""
+        lo, hi = 0, len(self._array)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._array[mid]
+            suffix = self._suffix(entry)
+            if suffix < text or (key is not None and suffix == text and entry[0] < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _offsets(self, tokens):
+        offsets, position = [], 0
+        for token in tokens:
+            offsets.append(position)
+            position += len(token) + 1
+        return offsets
+
+    def _add(self, key, item, bulk=False):
+        title, category = item.get('title') or '', item.get('category')
+        tokens = words(title)
+        if not tokens:
+            return
+        self._docs[key] = (title, category, ' '.join(tokens))
+        for offset in self._offsets(tokens):
+            if bulk:
+                self._array.append((key, offset))
+            else:
+                self._array.insert(self._bisect(self._docs[key][2][offset:], key), (key, offset))
+
+    def _remove(self, key):
+        doc = self._docs.get(key)
+        if doc is None:
+            return
+        text = doc[2]
+        for offset in self._offsets(text.split(' ')):
+            i = self._bisect(text[offset:], key)
+            if i < len(self._array) and self._array[i] == (key, offset):
+                del self._array[i]
+        del self._docs[key]
+
+    def reset(self, data):
+        with self._lock:
+            self._array, self._docs = [], {}
+            items = data.values() if isinstance(data, dict) else data
+            for item in items:
+                self._add(item_key(self.collection, item), item, bulk=True)
+            self._array.sort(key=lambda entry: (self._suffix(entry), entry[0]))
+
+    def on_op(self, op, old):
+        key = op['key']
+        with self._lock:
+            if op['op'] == 'put':
+                doc = self._docs.get(key)
+                item = op['item']
+                if doc is not None and doc[:2] == (item.get('title') or '', item.get('category')):
+                    return
+                self._remove(key)
+                self._add(key, item)
+            else:
+                self._remove(key)
+
+    def complete(self, prefix, category=None, limit=8):
+        """Returns [(key, title), ...]; titles starting with prefix come first"""
+        prefix = ' '.join(words(prefix))
+        if not prefix:
+            return []
+        with self._lock:
+            array = self._array
+            found = {}
+            i = self._bisect(prefix)
+            end = min(len(array), i + self.max_visit)
+            while i < end and len(found) < self.max_scan:
+                key, offset = array[i]
+                title, item_category, text = self._docs[key]
+                if not text.startswith(prefix, offset):
+                    break
+                i += 1
+                if category is not None and item_category != category:
+                    continue
+                # Rank matches at the start of the title above mid-title ones
+                rank = (offset > 0, len(title), title)
+                if key not in found or rank < found[key]:
+                    found[key] = rank
+        ranked = sorted(found.items(), key=lambda pair: pair[1])
+        return [(key, rank[2]) for key, rank in ranked[:limit]]
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import tempfile
+import threading
+
+
+class _Shard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.deltas = {}
+        self.seen = {}
+
+
+class ViewCounter:
+    """In-memory page view counter flushed to the store in batches.
+
+    record() only touches one of `shards` small dicts (picked by question
+    id), so concurrent requests rarely wait on each other and the read path
+    never writes to storage. A viewer is counted once per question per
+    `window` seconds. flush_into() folds the accumulated deltas into the
+    questions as one deferred transaction.
+
+    On backends that rewrite a whole file per change, folding on every
+    flush would turn read traffic into full rewrites. With `path` set the
+    deltas are then only saved to that small side file, and folded in once
+    the collection has been written for another reason (or has other
+    deferred changes waiting). Deltas left in the side file are picked up
+    again on start.
+    """
+
+    def __init__(self, field='views', shards=16, window=30 * 60, max_seen=100000, path=None):
+        self.field = field
+        self.window = window
+        self.max_seen = max_seen
+        self.path = path
+        self._shards = [_Shard() for _ in range(shards)]
+        self._saved = {}
+        self._version = None
+        if path:
+            self._saved = self._read_side_file()
+            self.restore(self._saved)
+
+    def _shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+
+    def record(self, key, viewer=None, now=None):
+        """Count a view of key; returns False if viewer was already counted in the window"""
+        now = time.time() if now is None else now
+        shard = self._shard(key)
+        with shard.lock:
+            if viewer is not None:
+                last = shard.seen.get((viewer, key))
+                if last is not None and now - last < self.window:
+                    return False
+                shard.seen[(viewer, key)] = now
+                if len(shard.seen) > self.max_seen // len(self._shards):
+                    self._prune(shard, now)
+            shard.deltas[key] = shard.deltas.get(key, 0) + 1
+        return True
+
+    def _prune(self, shard, now):
+        shard.seen = {k: t for k, t in shard.seen.items() if now - t < self.window}
+
+    def pending(self, key):
+        """Views recorded for key but not flushed yet"""
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.deltas.get(key, 0)
+
+    def snapshot(self):
+        """Copy of every pending delta"""
+        deltas = {}
+        for shard in self._shards:
+            with shard.lock:
+                deltas.update(shard.deltas)
+        return deltas
+
+    def drain(self):
+        deltas = {}
+        for shard in self._shards:
+            with shard.lock:
+                shard.deltas, taken = {}, shard.deltas
+            deltas.update(taken)
+        return deltas
+
+    def restore(self, deltas):
+        for key, delta in deltas.items():
+            shard = self._shard(key)
+            with shard.lock:
+                shard.deltas[key] = shard.deltas.get(key, 0) + delta
+
+    def flush_into(self, store, collection='qa'):
+        """Add the pending deltas to the stored entities, or only to the side file (see above)"""
+        if self.path and not self._should_fold(store, collection):
+            self._write_side_file(self.snapshot())
+            return 0
+        deltas = self.drain()
+        if deltas:
+            def apply(txn):
+                for key, delta in deltas.items():
+                    item = txn.get(key)
+                    if item is None:
+                        continue  # deleted in the meantime
+                    item[self.field] = item.get(self.field, 0) + delta
+                    txn.put(item, key)
+
+            try:
+                store.update(collection, apply, defer=True)
+                if self.path:
+                    store.flush(collection)
+            except Exception:
+                self.restore(deltas)
+                raise
+        if self.path:
+            self._version = store.version(collection)
+            self._write_side_file(self.snapshot())
+        return len(deltas)
+
+    def _should_fold(self, store, collection):
+        if store.backend_writes_entities(collection) or store.pending_count(collection):
+            return True
+        version = store.version(collection)
+        if self._version is None:
+            self._version = version
+        # Written since the last fold: one more rewrite then is bounded by real writes, not by views
+        return version != self._version
+
+    def _read_side_file(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return {k: int(v) for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, AttributeError) as e:
+            print(f"❌ View counter file error ({self.path}): {e}")
+            return {}
+
+    def _write_side_file(self, deltas):
+        if deltas == self._saved:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', prefix='.tmp_', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(deltas, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self._saved = deltas
@@ -0,0 +1,134 @@
+import threading
+
+from storage import StoreListener
+from storage.ops import item_key
+
+from .text import words, strip_tags
+
+_MASK = (1 << 64) - 1
+
+
+def _hash(shingle):
+    # Signatures live only in memory, so the per-process str hash is enough
+    return hash(shingle) & _MASK
+
+
+class DuplicateIndex(StoreListener):
+    """MinHash signatures of question text with LSH banding.
+
+    Each question is reduced to word shingles and a num_perm MinHash
+    signature, computed with one-permutation hashing: every shingle is
+    hashed once and lands in one of num_perm bins, and each bin keeps its
+    minimum. Empty bins borrow from the next filled one. This costs one
+    hash per shingle instead of num_perm. The signature is cut into bands,
+    and every band is a bucket key. similar() only compares questions that
+    share at least one bucket with the candidate, so its cost doesn't grow
+    with the collection. With 16 bands of 4 rows, pairs around 0.5 Jaccard
+    similarity or more are very likely to become candidates.
+
+    Only the signature of each question is kept (not its text); an update
+    whose signature is unchanged leaves the buckets alone.
+    """
+
+    def __init__(self, collection='qa', num_perm=64, bands=16, shingle_size=3, clean=None):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.collection = collection
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.clean = clean or strip_tags
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._docs = {}
+
+    def _text(self, item):
+        return f"{item.get('title') or ''} {self.clean(item.get('content'))}"
+
+    def _shingles(self, text):
+        tokens = words(text)
+        n = self.shingle_size
+        if len(tokens) < n:
+            return {' '.join(tokens)} if tokens else set()
+        return {' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)}
+
+    def signature(self, text):
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        k = self.num_perm
+        bins = [None] * k
+        for shingle in shingles:
+            h = _hash(shingle)
+            i, value = h % k, h // k
+            if bins[i] is None or value < bins[i]:
+                bins[i] = value
+        # Densify: an empty bin takes the next filled bin's value, tagged with the distance
+        signature = []
+        for i in range(k):
+            for dist in range(k):
+                value = bins[(i + dist) % k]
+                if value is not None:
+                    signature.append((dist, value))
+                    break
+        return tuple(signature)
+
+    def _band_keys(self, signature):
+        return [(i, signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _add(self, key, signature):
+        if signature is None:
+            return
+        self._docs[key] = signature
+        for band in self._band_keys(signature):
+            self._buckets.setdefault(band, set()).add(key)
+
+    def _remove(self, key):
+        signature = self._docs.pop(key, None)
+        if signature is None:
+            return
+        for band in self._band_keys(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def reset(self, data):
+        with self._lock:
+            self._buckets, self._docs = {}, {}
+            items = data.values() if isinstance(data, dict) else data
+            for item in items:
+                self._add(item_key(self.collection, item), self.signature(self._text(item)))
+
+    def on_op(self, op, old):
+        key = op['key']
+        signature = self.signature(self._text(op['item'])) if op['op'] == 'put' else None
+        with self._lock:
+            if op['op'] == 'put':
+                if signature is not None and self._docs.get(key) == signature:
+                    return  # answers/votes changed, the question text didn't
+                self._remove(key)
+                self._add(key, signature)
+            else:
+                self._remove(key)
+
+    def similar(self, item, threshold=0.5, limit=5, exclude=None):
+        """[(estimated Jaccard similarity, key), ...] best first for an unsaved or stored question"""
+        signature = self.signature(self._text(item))
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for band in self._band_keys(signature):
+                candidates |= self._buckets.get(band, set())
+            candidates.discard(exclude)
+            scored = []
+            for key in candidates:
+                other = self._docs[key]
+                score = sum(1 for x, y in zip(signature, other) if x == y) / len(signature)
+                if score >= threshold:
+                    scored.append((score, key))
+        scored.sort(reverse=True)
+        return scored[:limit]
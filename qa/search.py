@@ -0,0 +1,110 @@
+import math
+import heapq
+import threading
+from collections import Counter
+
+from storage import StoreListener
+from storage.ops import item_key
+
+from .text import tokenize, strip_tags
+
+
+class SearchIndex(StoreListener):
+    """Inverted index over question titles, bodies and answers, ranked with BM25.
+
+    Kept in sync through the store's listener hook, so a new question or
+    answer costs one document re-tokenization and search never rescans the
+    collection. Title words count title_weight times.
+    """
+
+    def __init__(self, collection='qa', k1=1.2, b=0.75, title_weight=3, clean=None):
+        self.collection = collection
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.clean = clean or strip_tags
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._docs = {}
+        self._total_len = 0
+
+    def _terms(self, item):
+        terms = Counter()
+        for token in tokenize(item.get('title')):
+            terms[token] += self.title_weight
+        terms.update(tokenize(self.clean(item.get('content'))))
+        for answer in item.get('answers', []):
+            terms.update(tokenize(self.clean(answer.get('text'))))
+        return terms
+
+    def _add(self, key, item):
+        terms = self._terms(item)
+        length = sum(terms.values())
+        self._docs[key] = (terms, length, item.get('category'))
+        self._total_len += length
+        postings = self._postings
+        for term, tf in terms.items():
+            posting = postings.get(term)
+            if posting is None:
+                postings[term] = {key: tf}
+            else:
+                posting[key] = tf
+
+    def _remove(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        terms, length, _ = doc
+        self._total_len -= length
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[term]
+
+    def reset(self, data):
+        with self._lock:
+            self._postings, self._docs, self._total_len = {}, {}, 0
+            items = data.values() if isinstance(data, dict) else data
+            for item in items:
+                self._add(item_key(self.collection, item), item)
+
+    def on_op(self, op, old):
+        key = op['key']
+        with self._lock:
+            if op['op'] == 'put':
+                doc = self._docs.get(key)
+                item = op['item']
+                if doc is not None and doc[2] == item.get('category') and doc[0] == self._terms(item):
+                    return  # votes, views etc. don't change the text
+                self._remove(key)
+                self._add(key, item)
+            else:
+                self._remove(key)
+
+    def search(self, query, category=None, limit=10, offset=0):
+        """Returns (total matches, [(score, key), ...]) best first"""
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._docs)
+            if not terms or not n:
+                return 0, []
+            avg_len = self._total_len / n
+            scores = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for key, tf in posting.items():
+                    doc = self._docs[key]
+                    if category and doc[2] != category:
+                        continue
+                    norm = tf + self.k1 * (1 - self.b + self.b * doc[1] / avg_len)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / norm
+        best = heapq.nlargest(offset + limit, ((score, key) for key, score in scores.items()))
+        return len(scores), best[offset:]
+
+    def __len__(self):
+        return len(self._docs)
@@ -0,0 +1,128 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+
+from storage import StoreListener
+from storage.ops import item_key
+
+MAX_TAGS = 5
+MAX_TAG_LENGTH = 30
+_TAG_CHARS = re.compile(r'[^\w+#.-]+', re.UNICODE)
+
+
+def normalize_tags(raw):
+    """Clean user supplied tags: lowercase, no spaces, unique, at most MAX_TAGS"""
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    if not isinstance(raw, (list, tuple)):
+        return []
+    tags = []
+    for tag in raw:
+        if not isinstance(tag, str):
+            continue
+        tag = _TAG_CHARS.sub('-', tag.strip().lower()).strip('-.')[:MAX_TAG_LENGTH]
+        if tag and tag not in tags:
+            tags.append(tag)
+        if len(tags) == MAX_TAGS:
+            break
+    return tags
+
+
+class TagIndex(StoreListener):
+    """tag -> question ids ordered newest first, plus facet counts.
+
+    Postings are kept per tag and per (category, tag) as sorted
+    (timestamp, id) arrays, so a tag page is a bisect and a slice. Tag
+    counts per category and question counts per category are updated on
+    every op, so facets() doesn't scan anything.
+    """
+
+    def __init__(self, collection='qa'):
+        self.collection = collection
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._docs = {}
+        self._tag_counts = {}
+        self._category_counts = Counter()
+
+    def _entry(self, item):
+        return item.get('category'), tuple(normalize_tags(item.get('tags') or [])), item.get('timestamp', 0)
+
+    def _partitions(self, category, tag):
+        return (tag, (category, tag))
+
+    def _add(self, key, item, insert=insort):
+        entry = self._entry(item)
+        category, tags, timestamp = entry
+        self._docs[key] = entry
+        self._category_counts[category] += 1
+        for tag in tags:
+            for part in self._partitions(category, tag):
+                insert(self._postings.setdefault(part, []), (timestamp, key))
+            for scope in {None, category}:
+                self._tag_counts.setdefault(scope, Counter())[tag] += 1
+
+    def _remove(self, key):
+        entry = self._docs.pop(key, None)
+        if entry is None:
+            return
+        category, tags, timestamp = entry
+        self._category_counts[category] -= 1
+        if self._category_counts[category] <= 0:
+            del self._category_counts[category]
+        for tag in tags:
+            for part in self._partitions(category, tag):
+                posting = self._postings.get(part, [])
+                i = bisect_left(posting, (timestamp, key))
+                if i < len(posting) and posting[i] == (timestamp, key):
+                    del posting[i]
+                if not posting:
+                    self._postings.pop(part, None)
+            for scope in {None, category}:
+                counts = self._tag_counts.get(scope)
+                if counts is not None:
+                    counts[tag] -= 1
+                    if counts[tag] <= 0:
+                        del counts[tag]
+
+    def reset(self, data):
+        with self._lock:
+            self._postings, self._docs, self._tag_counts = {}, {}, {}
+            self._category_counts = Counter()
+            items = data.values() if isinstance(data, dict) else data
+            for item in items:
+                self._add(item_key(self.collection, item), item, insert=list.append)
+            for posting in self._postings.values():
+                posting.sort()
+
+    def on_op(self, op, old):
+        key = op['key']
+        with self._lock:
+            if op['op'] == 'put' and self._docs.get(key) == self._entry(op['item']):
+                return
+            self._remove(key)
+            if op['op'] == 'put':
+                self._add(key, op['item'])
+
+    def page(self, tag, category=None, cursor=None, limit=10):
+        """Newest-first ids with tag; same cursor contract as SortedView.page()"""
+        part = tag if category is None else (category, tag)
+        with self._lock:
+            posting = self._postings.get(part, [])
+            end = len(posting) if cursor is None else bisect_left(posting, cursor)
+            start = max(end - limit, 0)
+            entries = posting[start:end][::-1]
+        next_cursor = entries[-1] if start > 0 and entries else None
+        return [key for _, key in entries], next_cursor
+
+    def count(self, tag, category=None):
+        with self._lock:
+            return self._tag_counts.get(category, {}).get(tag, 0)
+
+    def facets(self, category=None, limit=20):
+        """{'tags': [(tag, count), ...] most used first, 'categories': {category: question count}}"""
+        with self._lock:
+            tags = self._tag_counts.get(category, Counter()).most_common(limit)
+            categories = dict(self._category_counts)
+        return {'tags': tags, 'categories': categories}
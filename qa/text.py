@@ -0,0 +1,28 @@
+import re
+import unicodedata
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+_TAG = re.compile('<.*?>')
+
+
+def fold(text):
+    """Lowercase and drop diacritics, so 'Şəkil' and 'sekil' compare equal"""
+    text = text.lower()
+    if text.isascii():
+        return text
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).replace('ə', 'e').replace('ı', 'i')
+
+
+def strip_tags(text):
+    return _TAG.sub('', text) if text else ''
+
+
+def words(text):
+    """All folded words of text, in order"""
+    return _TOKEN.findall(fold(text)) if text else []
+
+
+def tokenize(text):
+    """Folded word tokens of text; single characters are dropped"""
+    return [t for t in words(text) if len(t) > 1 or t.isdigit()]
@@ -0,0 +1,51 @@
+def reply_parent_id(answer):
+    """Id of the answer this one replies to (reply_to is {'id', 'name'} from the editor or a bare id)"""
+    reply_to = answer.get('reply_to')
+    if isinstance(reply_to, dict):
+        return reply_to.get('id')
+    return reply_to or None
+
+
+def build_tree(answers):
+    """Arrange answers into reply threads in one pass.
+
+    Returns (roots, nodes): nodes maps answer id -> {'answer', 'children'}
+    and roots are the nodes that answer the question itself. Replies whose
+    parent was deleted are promoted to roots. Order within a level follows
+    the answers list (oldest first).
+    """
+    nodes = {a['id']: {'answer': a, 'children': []} for a in answers if a.get('id')}
+    roots = []
+    for answer in answers:
+        node = nodes.get(answer.get('id'))
+        if node is None:
+            continue
+        parent = nodes.get(reply_parent_id(answer))
+        if parent is None or parent is node:
+            roots.append(node)
+        else:
+            parent['children'].append(node)
+    return roots, nodes
+
+
+def window(nodes, offset=0, limit=20, child_limit=3, depth=3):
+    """Trim a level of the tree for rendering.
+
+    Keeps nodes[offset:offset + limit] and, recursively, the first
+    child_limit replies of each down to depth levels. Every returned node
+    says how many replies were left out ('more') and where loading them
+    should continue ('next_offset'); with depth exhausted the whole
+    subtree is left for lazy loading.
+    """
+    page = []
+    for node in nodes[offset:offset + limit]:
+        children = node['children']
+        shown = window(children, 0, child_limit, child_limit, depth - 1) if depth > 1 else []
+        page.append({
+            'answer': node['answer'],
+            'children': shown,
+            'reply_count': len(children),
+            'more': len(children) - len(shown),
+            'next_offset': len(shown),
+        })
+    return page
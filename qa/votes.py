@@ -0,0 +1,42 @@
+import math
+import hashlib
+
+# Reddit-style epoch; only differences matter, it just keeps the numbers small
+_EPOCH = 1134028003
+_DECAY = 45000
+
+
+def hot_score(item):
+    """Time-decayed rank: 10x the votes is worth 12.5 hours of age.
+
+    The age term grows with creation time instead of shrinking with
+    current time, so scores never need recomputing as the clock moves -
+    only a vote changes an item's position.
+    """
+    order = math.log10(max(item.get('votes', 0), 0) + 1)
+    seconds = item.get('timestamp', 0) / 1000 - _EPOCH
+    return round(order + seconds / _DECAY, 7)
+
+
+def voter_id(email):
+    """Short stable id stored in voter sets instead of the email itself"""
+    return hashlib.sha1(email.strip().lower().encode('utf-8')).hexdigest()[:12]
+
+
+def has_voted(item, voter):
+    return voter in item.get('voters', ())
+
+
+def set_vote(item, voter, on=True):
+    """Add/remove voter in item's voter set; returns False if nothing changed.
+
+    'votes' is kept equal to the size of the set, so a user can move the
+    count by at most one no matter how often the endpoint is called.
+    """
+    voters = item.get('voters', [])
+    if (voter in voters) == on:
+        return False
+    voters = voters + [voter] if on else [v for v in voters if v != voter]
+    item['voters'] = voters
+    item['votes'] = len(voters)
+    return True
@@ -1,11 +1,11 @@
 let currentFilter = 'categories';
-let currentPage = 1;
+let nextCursor = null;
 
 // Q&A.js içindəki switchTab funksiyasını bu kodla əvəzləyin
 
 function switchTab(tabName) {
     currentFilter = tabName;
-    currentPage = 1;
+    nextCursor = null;
     
     // Düymələrin rəngini/aktivliyini tənzimlə
     document.querySelectorAll('.cat-btn').forEach(btn => btn.classList.remove('active'));
@@ -27,21 +27,24 @@ function switchTab(tabName) {
         listDiv.innerHTML = '<p style="text-align:center; padding:20px;">Yüklənir...</p>';
         
         // API-dən sorğuları gətir
-        loadQuestions(tabName, 1);
+        loadQuestions(tabName, null);
     }
 }
 
+function loadMore() {
+    if (nextCursor) loadQuestions(currentFilter, nextCursor);
+}
+
 
-function loadQuestions(filter, page) {
-    fetch('/api/get_filtered_questions', {
-        method: 'POST',
-        headers: {'Content-Type': 'application/json'},
-        body: JSON.stringify({ filter: filter, page: page })
-    })
+function loadQuestions(filter, cursor) {
+    // GET: brauzer ETag ilə yoxlayır, dəyişiklik yoxdursa 304 alır
+    const params = new URLSearchParams({ filter: filter });
+    if (cursor) params.set('cursor', cursor);
+    fetch('/api/get_filtered_questions?' + params.toString())
     .then(res => res.json())
     .then(data => {
         const listDiv = document.getElementById('dynamic-list');
-        if(page === 1) listDiv.innerHTML = '';
+        if(!cursor) listDiv.innerHTML = '';
 
         data.data.forEach(q => {
             const div = document.createElement('div');
@@ -51,15 +54,73 @@ function loadQuestions(filter, page) {
             
             div.innerHTML = `
                 <div style="flex:1;">
-                    <h3>${q.title}</h3>
-                    <small>${q.author_name} • ${q.category}</small>
+                    <h3></h3>
+                    <small></small>
                 </div>
             `;
+            div.querySelector('h3').textContent = q.title;
+            div.querySelector('small').textContent = `${q.author_name} • ${q.category}`;
             listDiv.appendChild(div);
         });
 
+        nextCursor = data.next_cursor;
         const loadMoreBtn = document.getElementById('load-more-area');
         if(data.has_more) loadMoreBtn.classList.remove('hidden');
         else loadMoreBtn.classList.add('hidden');
     });
-}
\ No newline at end of file
+}
+
+// Axtarış: /api/search (BM25) nəticələrini dinamik siyahıda göstər
+let searchTimer = null;
+
+function renderSearchResults(results) {
+    const listDiv = document.getElementById('dynamic-list');
+    listDiv.innerHTML = '';
+    if (results.length === 0) {
+        listDiv.innerHTML = '<p style="text-align:center; padding:20px;">Heç nə tapılmadı.</p>';
+        return;
+    }
+    results.forEach(q => {
+        const div = document.createElement('div');
+        div.className = 'q-list-item';
+        div.style.cursor = 'pointer';
+        div.onclick = () => location.href = `/Q&A/view/${q.id}`;
+        div.innerHTML = `
+            <div style="flex:1;">
+                <h3></h3>
+                <small></small>
+            </div>
+        `;
+        div.querySelector('h3').textContent = q.title;
+        div.querySelector('small').textContent = `${q.author_name} • ${q.category} • ${q.answer_count} cavab`;
+        listDiv.appendChild(div);
+    });
+}
+
+const searchInput = document.getElementById('searchInput');
+if (searchInput) {
+    searchInput.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        const term = searchInput.value.trim();
+        searchTimer = setTimeout(() => {
+            const catDiv = document.getElementById('tab-categories');
+            const listDiv = document.getElementById('dynamic-list');
+            document.getElementById('load-more-area').classList.add('hidden');
+            if (!term) {
+                // Axtarış təmizləndi: aktiv taba qayıt
+                if (currentFilter === 'categories') {
+                    catDiv.style.display = 'grid';
+                    listDiv.style.display = 'none';
+                } else {
+                    loadQuestions(currentFilter, null);
+                }
+                return;
+            }
+            catDiv.style.display = 'none';
+            listDiv.style.display = 'flex';
+            fetch(`/api/search?q=${encodeURIComponent(term)}&limit=20`)
+                .then(res => res.json())
+                .then(data => { if (data.success) renderSearchResults(data.data); });
+        }, 250);
+    });
+}
@@ -0,0 +1,117 @@
+// Sual yazarkən mövcud başlıqları təklif et (dublikat sualları azaltmaq üçün)
+(function () {
+    const script = document.currentScript;
+    const category = script ? script.dataset.category : '';
+    const input = document.getElementById('newTitle');
+    if (!input) return;
+
+    const box = document.createElement('div');
+    box.className = 'autocomplete-box';
+    box.style.cssText = 'display:none; margin-top:4px; border:1px solid #334155; border-radius:8px; overflow:hidden;';
+    input.insertAdjacentElement('afterend', box);
+
+    let timer = null;
+    let lastQuery = '';
+
+    function render(items) {
+        box.innerHTML = '';
+        if (items.length === 0) {
+            box.style.display = 'none';
+            return;
+        }
+        const header = document.createElement('div');
+        header.style.cssText = 'padding:6px 10px; font-size:12px; color:#94a3b8;';
+        header.textContent = 'Oxşar suallar:';
+        box.appendChild(header);
+        items.forEach(q => {
+            const a = document.createElement('a');
+            a.href = `/Q&A/view/${q.id}`;
+            a.target = '_blank';
+            a.textContent = q.title;
+            a.style.cssText = 'display:block; padding:6px 10px; color:#e2e8f0; text-decoration:none;';
+            box.appendChild(a);
+        });
+        box.style.display = 'block';
+    }
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const term = input.value.trim();
+        if (term.length < 2) {
+            render([]);
+            return;
+        }
+        timer = setTimeout(() => {
+            lastQuery = term;
+            fetch(`/api/autocomplete?q=${encodeURIComponent(term)}&category=${encodeURIComponent(category)}`)
+                .then(res => res.json())
+                .then(data => {
+                    // Köhnə cavablar yeni yazılanı əvəz etməsin
+                    if (data.success && lastQuery === term) render(data.data);
+                });
+        }, 150);
+    });
+})();
+
+// Göndərməzdən əvvəl: başlıq və mətnə görə oxşar (dublikat ola biləcək) sualları göstər
+(function () {
+    const titleInput = document.getElementById('newTitle');
+    const anchor = document.getElementById('newTags');
+    if (!titleInput || !anchor) return;
+
+    const box = document.createElement('div');
+    box.className = 'duplicate-warning';
+    box.style.cssText = 'display:none; margin-top:8px; padding:8px 10px; border:1px solid #b45309; border-radius:8px; background:rgba(180,83,9,0.1);';
+    anchor.insertAdjacentElement('afterend', box);
+
+    let timer = null;
+    let requestId = 0;
+
+    function render(items) {
+        box.innerHTML = '';
+        if (items.length === 0) {
+            box.style.display = 'none';
+            return;
+        }
+        const header = document.createElement('div');
+        header.style.cssText = 'font-size:12px; color:#fbbf24; margin-bottom:4px;';
+        header.textContent = 'Bu sual artıq verilmiş ola bilər:';
+        box.appendChild(header);
+        items.forEach(q => {
+            const a = document.createElement('a');
+            a.href = `/Q&A/view/${q.id}`;
+            a.target = '_blank';
+            a.textContent = `${q.title} (${Math.round(q.similarity * 100)}%)`;
+            a.style.cssText = 'display:block; padding:2px 0; color:#e2e8f0;';
+            box.appendChild(a);
+        });
+        box.style.display = 'block';
+    }
+
+    function check() {
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            const title = titleInput.value.trim();
+            const content = typeof quill !== 'undefined' && quill ? quill.root.innerHTML : '';
+            if (title.length < 5) {
+                render([]);
+                return;
+            }
+            const current = ++requestId;
+            fetch('/api/similar_questions', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ title: title, content: content })
+            })
+                .then(res => res.json())
+                .then(data => {
+                    if (data.success && current === requestId) render(data.data);
+                });
+        }, 600);
+    }
+
+    titleInput.addEventListener('input', check);
+    // Quill yalnız forma açılanda yaradılır; redaktorun input hadisələri konteynerə qədər qalxır
+    const editor = document.getElementById('editor-container');
+    if (editor) editor.addEventListener('input', check);
+})();
@@ -0,0 +1,10 @@
+from .document_store import DocumentStore
+from .transaction import ConflictError
+from .json_backend import JsonFileBackend
+from .journal import JournalBackend, JournalCompactor
+from .sqlite_backend import SqliteBackend
+from .sharded import ShardedBackend
+from .write_behind import WriteBehindFlusher
+from .indexes import StoreListener, SecondaryIndex
+from .views import SortedView, encode_cursor, decode_cursor
+from .counters import Counters
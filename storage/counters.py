@@ -0,0 +1,70 @@
+import threading
+from collections import Counter
+
+from .indexes import StoreListener
+from .ops import item_key
+
+
+class Counters(StoreListener):
+    """Running totals over a collection, adjusted by each op instead of recounted.
+
+    `measures` maps a name to fn(item) -> number; the total is the sum over
+    all entities. `groups` maps a name to fn(item) -> key; the result is a
+    count of entities per key. Each entity's last contribution is
+    remembered so an update subtracts exactly what it added.
+    """
+
+    def __init__(self, collection, measures=None, groups=None):
+        self.collection = collection
+        self.measures = measures or {}
+        self.groups = groups or {}
+        self._lock = threading.Lock()
+        self._contributions = {}
+        self._totals = Counter()
+        self._groups = {name: Counter() for name in self.groups}
+
+    def _contribution(self, item):
+        values = tuple(fn(item) for fn in self.measures.values())
+        keys = tuple(fn(item) for fn in self.groups.values())
+        return values, keys
+
+    def _apply(self, contribution, sign):
+        values, keys = contribution
+        for name, value in zip(self.measures, values):
+            self._totals[name] += sign * value
+        for name, key in zip(self.groups, keys):
+            if key is None:
+                continue
+            counts = self._groups[name]
+            counts[key] += sign
+            if counts[key] <= 0:
+                del counts[key]
+
+    def reset(self, data):
+        with self._lock:
+            self._contributions = {}
+            self._totals = Counter({name: 0 for name in self.measures})
+            self._groups = {name: Counter() for name in self.groups}
+            pairs = data.items() if isinstance(data, dict) else ((item_key(self.collection, i), i) for i in data)
+            for key, item in pairs:
+                contribution = self._contribution(item)
+                self._contributions[key] = contribution
+                self._apply(contribution, 1)
+
+    def on_op(self, op, old):
+        key = op['key']
+        with self._lock:
+            previous = self._contributions.pop(key, None)
+            if previous is not None:
+                self._apply(previous, -1)
+            if op['op'] == 'put':
+                contribution = self._contribution(op['item'])
+                self._contributions[key] = contribution
+                self._apply(contribution, 1)
+
+    def snapshot(self):
+        """{measure: total, ..., group: {key: count}} as plain dicts"""
+        with self._lock:
+            result = {name: self._totals.get(name, 0) for name in self.measures}
+            result.update({name: dict(counts) for name, counts in self._groups.items()})
+        return result
@@ -0,0 +1,404 @@
+import os
+import time
+import threading
+
+from .ops import apply_op, put_op, delete_op, item_key
+from .transaction import Transaction, ConflictError
+from .indexes import SecondaryIndex
+
+
+class DocumentStore:
+    """Resident, thread-safe cache of the TechHub collections.
+
+    Reads are served from memory; the backend is only consulted on the first
+    read of a collection or when its on-disk signature (mtime/size) changed
+    because something outside this process edited the file. Writes go through
+    to the backend before the cached copy is replaced.
+
+    Callers get the cached object itself, so anything they mutate must be
+    handed back through save(), or through put()/delete() when only one
+    entity changed so the backend can persist just that entity. Handlers
+    that read, change and write back should use update()/modify(), which
+    detect concurrent writers through per-collection version numbers.
+
+    Small, frequent updates (lastLogin, answerCount...) can pass defer=True:
+    they are visible to readers at once but only reach the backend on the
+    next flush(), which also runs as soon as `flush_threshold` entities are
+    waiting. Several updates to one entity in between cost a single write.
+
+    Derived structures (secondary indexes, sorted views...) register with
+    subscribe() and are told about every reload and every entity change.
+    """
+
+    def __init__(self, backend, flush_threshold=100):
+        self.backend = backend
+        self.flush_threshold = flush_threshold
+        self._lock = threading.RLock()
+        self._data = {}
+        self._signatures = {}
+        self._key_indexes = {}
+        self._versions = {}
+        self._modified = {}
+        # Versions restart at 0 with the process; epoch tells the runs apart (e.g. in ETags)
+        self.epoch = os.urandom(4).hex()
+        self._pending = {}
+        self._listeners = {}
+        self._indexes = {}
+        self._views = {}
+        self._stats = {'hits': 0, 'misses': 0, 'reloads': 0, 'writes': 0, 'conflicts': 0,
+                       'deferred': 0, 'flushes': 0}
+
+    def load(self, collection):
+        with self._lock:
+            signature = self.backend.signature(collection)
+            if collection in self._data:
+                if signature == self._signatures.get(collection):
+                    self._stats['hits'] += 1
+                    return self._data[collection]
+                self._stats['reloads'] += 1
+            else:
+                self._stats['misses'] += 1
+            # Signature is taken before reading so a write racing with the
+            # read is picked up on the next load instead of being missed.
+            data = self.backend.load(collection)
+            # Deferred changes are not on disk yet, keep them on top
+            for key, item in self._pending.get(collection, {}).items():
+                apply_op(collection, data, put_op(key, item))
+            self._data[collection] = data
+            self._signatures[collection] = signature
+            self._key_indexes.pop(collection, None)
+            self._bump(collection)
+            self._notify_reset(collection, data)
+            return data
+
+    def get(self, collection, key):
+        """One entity by id/email, None if missing.
+
+        Resident collections answer from an id -> entity map; otherwise a
+        backend that can look entities up by key (SQLite, sharded files) is
+        asked directly instead of loading the whole collection.
+        """
+        with self._lock:
+            return self._lookup(collection)(key)
+
+    def find(self, collection, field, value):
+        """Entities whose field equals value, in collection order"""
+        with self._lock:
+            index = self._indexes.get((collection, field))
+            if index is not None:
+                self.load(collection)
+                return index.lookup(value)
+            if (collection not in self._data and hasattr(self.backend, 'indexed')
+                    and self.backend.indexed(collection, field)):
+                return self._overlay(collection, self.backend.find(collection, field, value), field, value)
+            data = self.load(collection)
+            items = data.values() if isinstance(data, dict) else data
+            return [item for item in items if item.get(field) == value]
+
+    def count(self, collection):
+        """Number of entities, without loading a cold collection when the backend can count"""
+        with self._lock:
+            if self._is_cold(collection) and hasattr(self.backend, 'count'):
+                pending = self._pending.get(collection, {})
+                new = sum(1 for key in pending if self.backend.get(collection, key) is None)
+                return self.backend.count(collection) + new
+            return len(self.load(collection))
+
+    def subscribe(self, listener):
+        """Keep listener (see indexes.StoreListener) in sync with its collection"""
+        with self._lock:
+            collection = listener.collection
+            self._listeners.setdefault(collection, []).append(listener)
+            if collection in self._data:
+                listener.reset(self.load(collection))
+            else:
+                self.load(collection)
+        return listener
+
+    def add_index(self, collection, field, normalize=None):
+        """Maintain a field -> entities index that find() will use"""
+        index = self.subscribe(SecondaryIndex(collection, field, normalize))
+        self._indexes[(collection, field)] = index
+        return index
+
+    def add_view(self, name, view):
+        """Register a derived view (any StoreListener, e.g. views.SortedView) under name"""
+        self._views[name] = self.subscribe(view)
+        return view
+
+    def view(self, name):
+        """The named view, brought up to date with the backend first"""
+        with self._lock:
+            view = self._views[name]
+            self.load(view.collection)
+            return view
+
+    def save(self, collection, data):
+        with self._lock:
+            self._write(collection, data)
+
+    def put(self, collection, item, key=None, defer=False):
+        """Insert or replace one entity (keyed by key, or item['id'])"""
+        if key is None:
+            key = item_key(collection, item)
+        self._apply(collection, put_op(key, item), defer)
+
+    def delete(self, collection, key):
+        self._apply(collection, delete_op(key))
+
+    def version(self, collection):
+        with self._lock:
+            self.load(collection)
+            return self._versions.get(collection, 0)
+
+    def last_modified(self, collection):
+        """Unix time of the collection's last change (or reload)"""
+        with self._lock:
+            self.load(collection)
+            return self._modified.get(collection)
+
+    def update(self, collection, fn, retries=10, defer=False):
+        """Run fn(txn) as an optimistic read-modify-write transaction.
+
+        fn works on private copies (txn.get/put/delete) without holding the
+        store lock. Its ops are committed only if the collection version is
+        still the one it started from; otherwise fn is run again on fresh
+        data. Returns whatever fn returned.
+        """
+        for _ in range(retries):
+            with self._lock:
+                lookup = self._lookup(collection)
+                version = self._versions.get(collection, 0)
+            txn = Transaction(collection, lookup)
+            result = fn(txn)
+            with self._lock:
+                if not self._is_cold(collection):
+                    self.load(collection)
+                if self._versions.get(collection, 0) != version:
+                    self._stats['conflicts'] += 1
+                    continue
+                for op in txn.ops:
+                    self._apply(collection, op, defer and op['op'] == 'put')
+                return result
+        raise ConflictError(f'{collection}: gave up after {retries} conflicting attempts')
+
+    def modify(self, collection, key, fn, retries=10, defer=False):
+        """update() for a single entity: fn(item) changes a copy in place.
+
+        Returns the committed entity, or None if it does not exist.
+        """
+        def change(txn):
+            item = txn.get(key)
+            if item is None:
+                return None
+            fn(item)
+            txn.put(item, key)
+            return item
+        return self.update(collection, change, retries, defer)
+
+    def flush(self, collection=None):
+        """Write deferred changes to the backend"""
+        with self._lock:
+            names = [collection] if collection else list(self._pending)
+            for name in names:
+                pending = self._pending.get(name)
+                if not pending:
+                    continue
+                signature = self._signatures.get(name)
+                if self.backend_writes_entities(name):
+                    data = self._data.get(name)
+                    for key, item in list(pending.items()):
+                        self.backend.save(name, data, put_op(key, item))
+                        signature = self._signature_after_write(name, signature)
+                        del pending[key]
+                else:
+                    # One whole-file write covers every pending entity
+                    data = self.load(name)
+                    self.backend.save(name, data)
+                    signature = self._signature_after_write(name, signature)
+                    pending.clear()
+                if name in self._data:
+                    self._signatures[name] = signature
+                self._stats['writes'] += 1
+                self._stats['flushes'] += 1
+
+    def collections(self):
+        """Names of every collection the backend holds"""
+        return self.backend.collections()
+
+    def iter_items(self, collection):
+        """(key, entity) pairs streamed from the backend after a flush.
+
+        For jobs that walk a whole collection (e.g. scans) without making it
+        resident; entities changed while the walk runs may or may not be seen.
+        """
+        self.flush(collection)
+        iter_items = getattr(self.backend, 'iter_items', None)
+        if iter_items is not None:
+            yield from iter_items(collection)
+            return
+        data = self.load(collection)
+        yield from (list(data.items()) if isinstance(data, dict) else [(item_key(collection, i), i) for i in data])
+
+    def pending_count(self, collection=None):
+        with self._lock:
+            if collection is not None:
+                return len(self._pending.get(collection, ()))
+            return sum(len(p) for p in self._pending.values())
+
+    def backend_writes_entities(self, collection):
+        writes_entities = getattr(self.backend, 'writes_entities', None)
+        return bool(writes_entities and writes_entities(collection))
+
+    def compact(self, collection):
+        """Fold a journaled collection's log into a fresh snapshot"""
+        with self._lock:
+            if not hasattr(self.backend, 'compact'):
+                return
+            data = self.load(collection)
+            expected = self._signatures.get(collection)
+            self.backend.compact(collection, data, expected=expected)
+            self._signatures[collection] = self._signature_after_write(collection, expected)
+
+    def _is_cold(self, collection):
+        """Not resident, but the backend can read and write single entities"""
+        return collection not in self._data and hasattr(self.backend, 'get')
+
+    def _lookup(self, collection):
+        if self._is_cold(collection):
+            pending = self._pending.get(collection, {})
+            return lambda key: pending[key] if key in pending else self.backend.get(collection, key)
+        return self._key_index(collection).get
+
+    def _overlay(self, collection, items, field, value):
+        """Swap in deferred versions of entities a backend query returned"""
+        pending = self._pending.get(collection)
+        if not pending:
+            return items
+        result, seen = [], set()
+        for item in items:
+            key = item_key(collection, item)
+            seen.add(key)
+            item = pending.get(key, item)
+            if item.get(field) == value:
+                result.append(item)
+        result.extend(item for key, item in pending.items() if key not in seen and item.get(field) == value)
+        return result
+
+    def _apply(self, collection, op, defer=False):
+        with self._lock:
+            if defer:
+                self._defer(collection, op)
+                return
+            # A synchronous write of this entity supersedes its deferred state
+            self._pending.get(collection, {}).pop(op['key'], None)
+            if self._is_cold(collection):
+                # Write just this entity without pulling the collection into memory
+                self.backend.save(collection, None, op)
+                self._stats['writes'] += 1
+                self._bump(collection)
+                return
+            old = self._old_item(collection, op)
+            data = apply_op(collection, self.load(collection), op)
+            self._write(collection, data, op)
+            self._notify_op(collection, op, old)
+            index = self._key_indexes.get(collection)
+            if index is not None and index is not data:
+                if op['op'] == 'put':
+                    index[op['key']] = op['item']
+                else:
+                    index.pop(op['key'], None)
+
+    def _defer(self, collection, op):
+        if not self._is_cold(collection):
+            old = self._old_item(collection, op)
+            data = apply_op(collection, self.load(collection), op)
+            self._notify_op(collection, op, old)
+            index = self._key_indexes.get(collection)
+            if index is not None and index is not data:
+                index[op['key']] = op['item']
+        self._pending.setdefault(collection, {})[op['key']] = op['item']
+        self._stats['deferred'] += 1
+        self._bump(collection)
+        if self.pending_count() >= self.flush_threshold:
+            self.flush()
+
+    def _old_item(self, collection, op):
+        if not self._listeners.get(collection):
+            return None
+        return self._key_index(collection).get(op['key'])
+
+    def _notify_op(self, collection, op, old):
+        for listener in self._listeners.get(collection, ()):
+            listener.on_op(op, old)
+
+    def _notify_reset(self, collection, data):
+        for listener in self._listeners.get(collection, ()):
+            listener.reset(data)
+
+    def _key_index(self, collection):
+        data = self.load(collection)
+        index = self._key_indexes.get(collection)
+        if index is None:
+            if isinstance(data, dict):
+                index = data
+            else:
+                index = {item_key(collection, item): item for item in data}
+            self._key_indexes[collection] = index
+        return index
+
+    def _signature_after_write(self, collection, expected):
+        """Signature to remember after our own write (expected: the one our copy was loaded at).
+
+        A backend shared with other processes (journal) reports it from under
+        its file lock, or None if someone else wrote first - the mismatch
+        then makes the next read reload instead of hiding their change.
+        """
+        written_signature = getattr(self.backend, 'written_signature', None)
+        if written_signature is None:
+            return self.backend.signature(collection)
+        return written_signature(collection, expected)
+
+    def _write(self, collection, data, op=None):
+        expected = self._signatures.get(collection)
+        try:
+            self.backend.save(collection, data, op)
+        except Exception:
+            # Memory may now disagree with disk, reload on next access
+            self.invalidate(collection)
+            raise
+        if op is None or not self.backend_writes_entities(collection):
+            # The whole file was written, deferred changes included
+            self._pending.pop(collection, None)
+        if op is None:
+            # Whole collection replaced (possibly the same list edited in place)
+            self._key_indexes.pop(collection, None)
+        self._data[collection] = data
+        self._signatures[collection] = self._signature_after_write(collection, expected)
+        self._stats['writes'] += 1
+        self._bump(collection)
+        if op is None:
+            self._notify_reset(collection, data)
+
+    def _bump(self, collection):
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+        self._modified[collection] = time.time()
+
+    def invalidate(self, collection=None):
+        with self._lock:
+            if collection is None:
+                self._data.clear()
+                self._signatures.clear()
+                self._key_indexes.clear()
+            else:
+                self._data.pop(collection, None)
+                self._signatures.pop(collection, None)
+                self._key_indexes.pop(collection, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['resident'] = sorted(self._data)
+            stats['versions'] = dict(self._versions)
+            stats['pending'] = sum(len(p) for p in self._pending.values())
+        return stats
@@ -0,0 +1,89 @@
+from .ops import NEWEST_FIRST, item_key
+
+
+class StoreListener:
+    """Something kept in sync with a collection by DocumentStore.
+
+    reset() gets the whole collection after a (re)load or a full save;
+    on_op() gets every single-entity change together with the entity as it
+    was before (None for inserts).
+    """
+
+    collection = None
+
+    def reset(self, data):
+        raise NotImplementedError
+
+    def on_op(self, op, old):
+        raise NotImplementedError
+
+
+class SecondaryIndex(StoreListener):
+    """field value -> entities, maintained on every mutation.
+
+    lookup() returns entities in collection order (newest first for
+    questions) without scanning the collection.
+    """
+
+    def __init__(self, collection, field, normalize=None):
+        self.collection = collection
+        self.field = field
+        self.normalize = normalize
+        self._buckets = {}
+
+    def _value(self, item):
+        value = item.get(self.field)
+        return self.normalize(value) if self.normalize else value
+
+    def _add(self, key, item):
+        value = self._value(item)
+        if value is None:
+            return
+        self._buckets.setdefault(value, {})[key] = item
+
+    def _remove(self, key, item):
+        bucket = self._buckets.get(self._value(item))
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._buckets[self._value(item)]
+
+    def reset(self, data):
+        self._buckets = {}
+        if isinstance(data, dict):
+            pairs = data.items()
+        else:
+            # Buckets keep insertion order; store newest-first lists oldest
+            # first so new entities can simply be appended.
+            items = reversed(data) if self.collection in NEWEST_FIRST else data
+            pairs = ((item_key(self.collection, item), item) for item in items)
+        for key, item in pairs:
+            self._add(key, item)
+
+    def on_op(self, op, old):
+        key = op['key']
+        if old is not None:
+            if op['op'] == 'put' and self._value(old) == self._value(op['item']):
+                bucket = self._buckets.get(self._value(old))
+                if bucket is not None and key in bucket:
+                    bucket[key] = op['item']
+                    return
+            self._remove(key, old)
+        if op['op'] == 'put':
+            self._add(key, op['item'])
+
+    def lookup(self, value):
+        if self.normalize:
+            value = self.normalize(value)
+        items = list(self._buckets.get(value, {}).values())
+        if self.collection in NEWEST_FIRST:
+            items.reverse()
+        return items
+
+    def count(self, value):
+        if self.normalize:
+            value = self.normalize(value)
+        return len(self._buckets.get(value, ()))
+
+    def values(self):
+        return list(self._buckets)
@@ -0,0 +1,199 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+from .json_backend import JsonFileBackend
+from .ops import apply_op
+
+
+class JournalBackend(JsonFileBackend):
+    """Snapshot + append-only log persistence.
+
+    For journaled collections a single-entity change is appended to
+    <file>.log as one JSON line instead of rewriting the whole file. Loading
+    replays the log on top of the last snapshot; compact() writes a fresh
+    snapshot and empties the log. Other collections behave exactly like
+    JsonFileBackend.
+
+    Appends and compactions hold an flock on <file>.log.lock, so several
+    processes sharing the files (e.g. the debug reloader's two processes)
+    can't truncate records another one just appended.
+    """
+
+    def __init__(self, paths, journaled=('qa',), fsync=False):
+        super().__init__(paths)
+        self.journaled = set(journaled)
+        self.fsync = fsync
+        self._log_lock = threading.Lock()
+        # collection -> (signature before, signature after) of this process's last write
+        self._writes = {}
+
+    def log_path(self, collection):
+        return self.paths[collection] + '.log'
+
+    @contextmanager
+    def _locked(self, collection):
+        with self._log_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.log_path(collection) + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def log_size(self, collection):
+        try:
+            return os.path.getsize(self.log_path(collection))
+        except FileNotFoundError:
+            return 0
+
+    def writes_entities(self, collection):
+        return collection in self.journaled
+
+    def signature(self, collection):
+        snapshot = super().signature(collection)
+        if collection not in self.journaled:
+            return snapshot
+        try:
+            st = os.stat(self.log_path(collection))
+            log = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            log = None
+        return (snapshot, log)
+
+    def load(self, collection):
+        if collection not in self.journaled:
+            return super().load(collection)
+        data, damaged = self._replay(collection)
+        if damaged:
+            # Later appends would be glued onto the torn line, so fold what
+            # was recovered into a new snapshot and start a clean log.
+            self.compact(collection)
+        return data
+
+    def _replay(self, collection):
+        data = super().load(collection)
+        damaged = []
+        for op in self._read_log(collection, damaged):
+            apply_op(collection, data, op)
+        return data, damaged
+
+    def save(self, collection, data, op=None):
+        if collection not in self.journaled:
+            return super().save(collection, data)
+        if op is None:
+            # Whole collection replaced: that is a compaction
+            self.compact(collection, data)
+            return
+        line = json.dumps(op, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._locked(collection):
+            before = self.signature(collection)
+            with open(self.log_path(collection), 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._writes[collection] = (before, self.signature(collection))
+
+    def compact(self, collection, data=None, expected=None):
+        """Snapshot the collection and truncate the log.
+
+        With data=None the snapshot is rebuilt from disk under the lock.
+        Given data, it is written as is - unless `expected` (the signature
+        the caller's copy was loaded at) no longer matches, i.e. another
+        process appended meanwhile; then the disk state is used instead.
+        Returns True if the caller's data was written.
+
+        Replaying ops is idempotent, so a crash between the two steps only
+        means some records get applied a second time on the next load.
+        """
+        with self._locked(collection):
+            before = self.signature(collection)
+            used = data is not None and (expected is None or before == expected)
+            if not used:
+                data, _ = self._replay(collection)
+            super().save(collection, data)
+            if collection in self.journaled:
+                open(self.log_path(collection), 'w').close()
+            self._writes[collection] = (before if used else None, self.signature(collection))
+            return used
+
+    def written_signature(self, collection, expected):
+        """Signature right after this process's last write, taken under the lock.
+
+        None unless the files were still at `expected` (the signature the
+        caller's copy was loaded at) when that write started: then another
+        process changed them in between and the caller must reload.
+        """
+        before, after = self._writes.get(collection, (None, None))
+        return after if before is not None and before == expected else None
+
+    def iter_items(self, collection):
+        if collection not in self.journaled:
+            yield from super().iter_items(collection)
+            return
+        # Log records can change any entity, so the snapshot can't be streamed on its own
+        data = self.load(collection)
+        yield from (data.items() if isinstance(data, dict) else ((item.get('id'), item) for item in data))
+
+    def _read_log(self, collection, damaged):
+        path = self.log_path(collection)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn tail from a crash mid-append
+                    print(f"⚠️ Journal: ignoring damaged record in {path}")
+                    damaged.append(line)
+
+
+class JournalCompactor:
+    """Background thread that folds the journal into the snapshot.
+
+    Runs every `interval` seconds and compacts a collection once its log has
+    grown past `min_log_bytes`.
+    """
+
+    def __init__(self, store, interval=60, min_log_bytes=256 * 1024):
+        self.store = store
+        self.interval = interval
+        self.min_log_bytes = min_log_bytes
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        backend = self.store.backend
+        for collection in backend.journaled:
+            if backend.log_size(collection) >= self.min_log_bytes:
+                try:
+                    self.store.compact(collection)
+                except Exception as e:
+                    print(f"❌ Journal compaction error ({collection}): {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
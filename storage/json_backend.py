@@ -0,0 +1,71 @@
+import os
+import json
+import tempfile
+
+from .streaming import iter_json_file
+
+# Empty value of every collection when its file does not exist yet
+DEFAULTS = {
+    'users': dict,
+    'projects': list,
+    'qa': list,
+}
+
+
+class JsonFileBackend:
+    """Whole-file JSON persistence: one file per collection."""
+
+    def __init__(self, paths):
+        self.paths = dict(paths)
+
+    def default(self, collection):
+        return DEFAULTS.get(collection, list)()
+
+    def collections(self):
+        return list(self.paths)
+
+    def writes_entities(self, collection):
+        """Whether save() can persist a single op without the rest of the collection"""
+        return False
+
+    def signature(self, collection):
+        """(mtime, size) of the collection file, None if it does not exist"""
+        try:
+            st = os.stat(self.paths[collection])
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self, collection):
+        path = self.paths[collection]
+        if not os.path.exists(path):
+            return self.default(collection)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return self.default(collection)
+
+    def iter_items(self, collection):
+        """(key, entity) pairs parsed one at a time from the file"""
+        path = self.paths[collection]
+        if os.path.exists(path):
+            yield from iter_json_file(path, collection)
+
+    def save(self, collection, data, op=None):
+        """Write the whole collection atomically (temp file + rename).
+
+        op describes the single-entity change that produced data; a whole-file
+        backend has no use for it.
+        """
+        path = self.paths[collection]
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
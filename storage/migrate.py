@@ -0,0 +1,63 @@
+"""Import the JSON files into the SQLite or sharded storage backend.
+
+    python -m storage.migrate [--db static/techhub.sqlite3] [--static static]
+    python -m storage.migrate --backend sharded [--dest static/techhub_db]
+
+The JSON files are parsed incrementally (one question/user/project at a
+time) and inserted in batches, so memory use stays flat no matter how big
+techhub_qa_db.json has grown.
+"""
+import os
+import sys
+import argparse
+
+from .streaming import iter_json_file
+from .sqlite_backend import SqliteBackend
+from .sharded import ShardedBackend
+
+FILES = {
+    'users': 'techhub_users_db.json',
+    'qa': 'techhub_qa_db.json',
+    'projects': 'techhub_projects.json',
+}
+
+
+def migrate(backend, static_dir='static', batch_size=500):
+    counts = {}
+    for collection, filename in FILES.items():
+        path = os.path.join(static_dir, filename)
+        if not os.path.exists(path):
+            print(f"⚠️ {path} not found, skipping")
+            continue
+        backend.clear(collection)
+        total, batch = 0, []
+        for pair in iter_json_file(path, collection):
+            batch.append(pair)
+            if len(batch) >= batch_size:
+                total += backend.insert_many(collection, batch, start=total)
+                batch = []
+        if batch:
+            total += backend.insert_many(collection, batch, start=total)
+        counts[collection] = total
+        print(f"✅ {collection}: {total} records imported from {path}")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import TechHub JSON files into SQLite or sharded storage')
+    parser.add_argument('--backend', choices=['sqlite', 'sharded'], default='sqlite')
+    parser.add_argument('--db', default=os.path.join('static', 'techhub.sqlite3'))
+    parser.add_argument('--dest', default=os.path.join('static', 'techhub_db'))
+    parser.add_argument('--static', default='static')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args(argv)
+    if args.backend == 'sharded':
+        backend = ShardedBackend(args.dest)
+    else:
+        backend = SqliteBackend(args.db)
+    migrate(backend, args.static, args.batch_size)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
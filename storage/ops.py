@@ -0,0 +1,46 @@
+# Single-entity mutations shared by the in-memory store and the journal replay.
+#
+# An op is a plain dict so it can be written to the journal as-is:
+#   {'op': 'put', 'key': <id/email>, 'item': {...}}
+#   {'op': 'delete', 'key': <id/email>}
+
+# List collections where new entities go to the front (newest first)
+NEWEST_FIRST = {'qa'}
+
+
+def item_key(collection, item):
+    return item.get('id')
+
+
+def put_op(key, item):
+    return {'op': 'put', 'key': key, 'item': item}
+
+
+def delete_op(key):
+    return {'op': 'delete', 'key': key}
+
+
+def apply_op(collection, data, op):
+    """Apply op to data in place. Replaying the same op twice is harmless."""
+    key = op['key']
+    if isinstance(data, dict):
+        if op['op'] == 'put':
+            data[key] = op['item']
+        else:
+            data.pop(key, None)
+        return data
+
+    for i, item in enumerate(data):
+        if item_key(collection, item) == key:
+            if op['op'] == 'put':
+                data[i] = op['item']
+            else:
+                del data[i]
+            return data
+
+    if op['op'] == 'put':
+        if collection in NEWEST_FIRST:
+            data.insert(0, op['item'])
+        else:
+            data.append(op['item'])
+    return data
@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import hashlib
+import tempfile
+import threading
+
+from .json_backend import DEFAULTS
+from .ops import NEWEST_FIRST
+
+_SAFE_KEY = re.compile(r'[A-Za-z0-9_-]{1,100}')
+
+
+def _write_atomic(path, payload):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ShardedBackend:
+    """One JSON file per question/user/project plus a small manifest.
+
+    Layout under root:
+        qa/manifest.json          ordered list of question ids
+        qa/<id>.json              one question with its answers
+        users/<sha1(email)>.json  one user
+
+    Changing an entity rewrites only its own file; the manifest is touched
+    only when an entity is added or removed. get() reads a single file, so
+    authenticating one login no longer parses every account.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.RLock()
+        self._manifests = {}
+
+    def default(self, collection):
+        return DEFAULTS.get(collection, list)()
+
+    def collections(self):
+        """The known collections plus any other directory under root"""
+        names = list(DEFAULTS)
+        if os.path.isdir(self.root):
+            names += sorted(name for name in os.listdir(self.root)
+                            if name not in DEFAULTS and os.path.isdir(os.path.join(self.root, name)))
+        return names
+
+    def _dir(self, collection):
+        path = os.path.join(self.root, collection)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _manifest_path(self, collection):
+        return os.path.join(self._dir(collection), 'manifest.json')
+
+    def _entity_path(self, collection, key):
+        key = str(key)
+        name = key if _SAFE_KEY.fullmatch(key) and key != 'manifest' else hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self._dir(collection), name + '.json')
+
+    def writes_entities(self, collection):
+        return True
+
+    def signature(self, collection):
+        try:
+            st = os.stat(self._manifest_path(collection))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    # --- manifest ---
+
+    def _manifest(self, collection):
+        manifest = self._manifests.get(collection)
+        if manifest is None or manifest[2] != self.signature(collection):
+            try:
+                with open(self._manifest_path(collection), 'r', encoding='utf-8') as f:
+                    keys = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                keys = []
+            manifest = (keys, set(keys), self.signature(collection))
+            self._manifests[collection] = manifest
+        return manifest
+
+    def _write_manifest(self, collection, keys):
+        _write_atomic(self._manifest_path(collection), json.dumps(keys, ensure_ascii=False))
+        self._manifests[collection] = (keys, set(keys), self.signature(collection))
+
+    # --- reads ---
+
+    def get(self, collection, key):
+        try:
+            with open(self._entity_path(collection, key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def load(self, collection):
+        with self._lock:
+            keys = list(self._manifest(collection)[0])
+        data = self.default(collection)
+        for key in keys:
+            item = self.get(collection, key)
+            if item is None:
+                continue
+            if isinstance(data, dict):
+                data[key] = item
+            else:
+                data.append(item)
+        return data
+
+    def iter_items(self, collection):
+        """(key, entity) pairs, reading one entity file at a time"""
+        with self._lock:
+            keys = list(self._manifest(collection)[0])
+        for key in keys:
+            item = self.get(collection, key)
+            if item is not None:
+                yield key, item
+
+    def count(self, collection):
+        with self._lock:
+            return len(self._manifest(collection)[0])
+
+    # --- writes ---
+
+    def save(self, collection, data, op=None):
+        with self._lock:
+            if op is None:
+                self._replace_all(collection, data)
+            elif op['op'] == 'put':
+                self._put(collection, op['key'], op['item'])
+            else:
+                self._delete(collection, op['key'])
+
+    def _put(self, collection, key, item):
+        # Entity first, manifest second: a crash in between leaves an unlisted file, not a dangling key
+        _write_atomic(self._entity_path(collection, key), json.dumps(item, ensure_ascii=False))
+        keys, members, _ = self._manifest(collection)
+        if key not in members:
+            keys = [key] + keys if collection in NEWEST_FIRST else keys + [key]
+            self._write_manifest(collection, keys)
+
+    def _delete(self, collection, key):
+        keys, members, _ = self._manifest(collection)
+        if key in members:
+            self._write_manifest(collection, [k for k in keys if k != key])
+        try:
+            os.remove(self._entity_path(collection, key))
+        except FileNotFoundError:
+            pass
+
+    def _replace_all(self, collection, data):
+        pairs = list(data.items()) if isinstance(data, dict) else [(item.get('id'), item) for item in data]
+        old_keys = set(self._manifest(collection)[0])
+        for key, item in pairs:
+            _write_atomic(self._entity_path(collection, key), json.dumps(item, ensure_ascii=False))
+        new_keys = [key for key, _ in pairs]
+        self._write_manifest(collection, new_keys)
+        for key in old_keys - set(new_keys):
+            try:
+                os.remove(self._entity_path(collection, key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self, collection):
+        with self._lock:
+            self._replace_all(collection, self.default(collection))
+
+    def insert_many(self, collection, pairs, start=0):
+        """Append (key, item) pairs in the given order (used by the migration)"""
+        with self._lock:
+            keys = list(self._manifest(collection)[0])
+            members = set(keys)
+            for key, item in pairs:
+                _write_atomic(self._entity_path(collection, key), json.dumps(item, ensure_ascii=False))
+                if key not in members:
+                    keys.append(key)
+                    members.add(key)
+            self._write_manifest(collection, keys)
+        return len(pairs)
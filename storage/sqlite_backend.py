@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+
+from .json_backend import DEFAULTS
+
+# collection -> (table, primary key column, indexed columns)
+TABLES = {
+    'users': ('users', 'email', ()),
+    'qa': ('questions', 'id', ('category', 'author_email', 'timestamp')),
+    'projects': ('projects', 'id', ('author_email', 'github_repo', 'synced', 'timestamp')),
+}
+
+# Extra composite indexes on top of the single-column ones
+COMPOSITE_INDEXES = {
+    'qa': [('category', 'timestamp')],
+}
+
+
+class SqliteBackend:
+    """SQLite persistence (stdlib sqlite3, WAL mode).
+
+    Every entity is stored as a JSON document next to the columns we look
+    it up by, so a single-entity change is one indexed row write and
+    get()/find() never have to read the whole collection. `position` keeps
+    the order the JSON lists had (questions newest first).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+    def collections(self):
+        return list(TABLES)
+
+    def _create_schema(self):
+        with self._lock:
+            for collection, (table, pk, columns) in TABLES.items():
+                extra = ''.join(f', {c}' for c in columns)
+                self._conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS {table} ('
+                    f'{pk} TEXT PRIMARY KEY, position INTEGER NOT NULL{extra}, doc TEXT NOT NULL)'
+                )
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_position ON {table}(position)')
+                for c in columns:
+                    self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{c} ON {table}({c})')
+                for combo in COMPOSITE_INDEXES.get(collection, []):
+                    name = '_'.join(combo)
+                    self._conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS idx_{table}_{name} ON {table}({", ".join(combo)})'
+                    )
+
+    def default(self, collection):
+        return DEFAULTS.get(collection, list)()
+
+    def signature(self, collection):
+        # data_version only moves when *another* connection commits, which is
+        # exactly the "modified outside this process" case.
+        with self._lock:
+            return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def writes_entities(self, collection):
+        return True
+
+    def indexed(self, collection, field):
+        table, pk, columns = TABLES[collection]
+        return field == pk or field in columns
+
+    # --- reads ---
+
+    def load(self, collection):
+        table, pk, _ = TABLES[collection]
+        with self._lock:
+            rows = self._conn.execute(f'SELECT {pk}, doc FROM {table} ORDER BY position').fetchall()
+        if collection == 'users':
+            return {key: json.loads(doc) for key, doc in rows}
+        return [json.loads(doc) for _, doc in rows]
+
+    def get(self, collection, key):
+        table, pk, _ = TABLES[collection]
+        with self._lock:
+            row = self._conn.execute(f'SELECT doc FROM {table} WHERE {pk} = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, collection, field, value):
+        if not self.indexed(collection, field):
+            raise KeyError(f'{collection}.{field} is not indexed')
+        table, _, _ = TABLES[collection]
+        if field == 'synced':
+            value = int(bool(value))
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT doc FROM {table} WHERE {field} = ? ORDER BY position', (value,)
+            ).fetchall()
+        return [json.loads(doc) for (doc,) in rows]
+
+    def iter_items(self, collection, batch_size=500):
+        """(key, entity) pairs in collection order, fetched in keyset batches"""
+        table, pk, _ = TABLES[collection]
+        last = None
+        while True:
+            with self._lock:
+                if last is None:
+                    rows = self._conn.execute(
+                        f'SELECT {pk}, position, doc FROM {table} ORDER BY position, {pk} LIMIT ?', (batch_size,)
+                    ).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        f'SELECT {pk}, position, doc FROM {table} WHERE (position, {pk}) > (?, ?) '
+                        f'ORDER BY position, {pk} LIMIT ?', (last[1], last[0], batch_size)
+                    ).fetchall()
+            for key, _, doc in rows:
+                yield key, json.loads(doc)
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][:2]
+
+    def count(self, collection):
+        table, _, _ = TABLES[collection]
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+    # --- writes ---
+
+    def save(self, collection, data, op=None):
+        with self._lock:
+            if op is None:
+                self._replace_all(collection, data)
+            elif op['op'] == 'put':
+                self._upsert(collection, op['key'], op['item'])
+            else:
+                table, pk, _ = TABLES[collection]
+                self._conn.execute(f'DELETE FROM {table} WHERE {pk} = ?', (op['key'],))
+
+    def insert_many(self, collection, pairs, start=0):
+        """Bulk insert (key, item) pairs at consecutive positions (used by the migration)"""
+        rows = [self._row(collection, key, start + i, item) for i, (key, item) in enumerate(pairs)]
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(self._insert_sql(collection, 'INSERT OR REPLACE'), rows)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return len(rows)
+
+    def clear(self, collection):
+        table, _, _ = TABLES[collection]
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {table}')
+
+    def _row(self, collection, key, position, item):
+        _, _, columns = TABLES[collection]
+        values = []
+        for c in columns:
+            v = item.get(c)
+            values.append(int(bool(v)) if c == 'synced' else v)
+        return (key, position, *values, json.dumps(item, ensure_ascii=False))
+
+    def _upsert(self, collection, key, item):
+        table, pk, columns = TABLES[collection]
+        if collection == 'qa':
+            position_sql = f'(SELECT COALESCE(MIN(position), 0) - 1 FROM {table})'
+        else:
+            position_sql = f'(SELECT COALESCE(MAX(position), -1) + 1 FROM {table})'
+        cols = [pk, *columns, 'doc']
+        row = self._row(collection, key, 0, item)
+        params = (row[0], *row[2:])
+        updates = ', '.join(f'{c} = excluded.{c}' for c in cols[1:])
+        self._conn.execute(
+            f'INSERT INTO {table} ({pk}, position, {", ".join(cols[1:])}) '
+            f'VALUES (?, {position_sql}, {", ".join("?" * (len(cols) - 1))}) '
+            f'ON CONFLICT({pk}) DO UPDATE SET {updates}',
+            params,
+        )
+
+    def _replace_all(self, collection, data):
+        table, _, _ = TABLES[collection]
+        items = data.items() if isinstance(data, dict) else ((item.get('id'), item) for item in data)
+        rows = [self._row(collection, key, i, item) for i, (key, item) in enumerate(items)]
+        self._conn.execute('BEGIN')
+        try:
+            self._conn.execute(f'DELETE FROM {table}')
+            self._conn.executemany(self._insert_sql(collection), rows)
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def _insert_sql(self, collection, verb='INSERT'):
+        table, pk, columns = TABLES[collection]
+        cols = [pk, 'position', *columns, 'doc']
+        return f'{verb} INTO {table} ({", ".join(cols)}) VALUES ({", ".join("?" * len(cols))})'
@@ -0,0 +1,97 @@
+"""Incremental reading of the TechHub JSON files (one entity at a time)"""
+import json
+
+_WHITESPACE = ' \t\r\n'
+
+
+class _StreamReader:
+    """Pulls top-level elements out of a JSON array/object without reading the whole file"""
+
+    def __init__(self, f, chunk_size=64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f'expected {char!r} at offset {self.pos}')
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number could continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _separator(self, closing):
+        char = self.peek()
+        if char == ',':
+            self.pos += 1
+            return True
+        if char == closing:
+            self.pos += 1
+            return False
+        raise ValueError(f'expected "," or {closing!r} at offset {self.pos}')
+
+    def iter_array(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self._separator(']'):
+                return
+
+    def iter_object(self):
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key, self.value()
+            if not self._separator('}'):
+                return
+
+
+def iter_json_file(path, collection):
+    """Yield (key, item) pairs from one of the TechHub JSON files"""
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _StreamReader(f)
+        if collection == 'users':
+            yield from reader.iter_object()
+        else:
+            for item in reader.iter_array():
+                yield item.get('id'), item
@@ -0,0 +1,39 @@
+import copy
+
+from .ops import put_op, delete_op, item_key
+
+
+class ConflictError(Exception):
+    """A transaction kept losing the race against other writers"""
+
+
+class Transaction:
+    """Private working set handed to the function passed to DocumentStore.update().
+
+    get() returns a deep copy, so nothing the function does is visible to
+    other threads until the store commits the recorded ops. The function
+    may be run again from scratch if another writer got in first.
+    """
+
+    def __init__(self, collection, lookup):
+        self.collection = collection
+        self._lookup = lookup
+        self._working = {}
+        self.ops = []
+
+    def get(self, key):
+        if key in self._working:
+            return self._working[key]
+        item = copy.deepcopy(self._lookup(key))
+        self._working[key] = item
+        return item
+
+    def put(self, item, key=None):
+        if key is None:
+            key = item_key(self.collection, item)
+        self._working[key] = item
+        self.ops.append(put_op(key, item))
+
+    def delete(self, key):
+        self._working[key] = None
+        self.ops.append(delete_op(key))
@@ -0,0 +1,134 @@
+import json
+import base64
+import threading
+from bisect import bisect_left, insort
+
+from .indexes import StoreListener
+from .ops import item_key
+
+
+def encode_cursor(position):
+    """Opaque, URL-safe token for a (sort key, entity key) position"""
+    raw = json.dumps(position, separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _freeze(value):
+    return tuple(_freeze(v) for v in value) if isinstance(value, list) else value
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor(); raises ValueError on a malformed token"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        sort_key, key = json.loads(raw.decode('utf-8'))
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'invalid cursor: {token!r}') from e
+    return _freeze(sort_key), key
+
+
+class SortedView(StoreListener):
+    """Entities of a collection kept ordered by sort_key, highest first.
+
+    Each mutation moves one entry with bisect (O(log n) search), so a page
+    is a slice of an already sorted list instead of a sorted() over the
+    whole collection. `predicate` limits which entities are in the view
+    and `partition` splits it into independent orders (e.g. per category).
+    Ties are broken by entity key so the order is total and stable.
+    Readers and the store's updates are serialised by a lock, and reads
+    return copied lists.
+    """
+
+    def __init__(self, collection, sort_key, predicate=None, partition=None):
+        self.collection = collection
+        self.sort_key = sort_key
+        self.predicate = predicate
+        self.partition = partition
+        self._lock = threading.Lock()
+        self._orders = {}
+        self._entries = {}
+        self._items = {}
+
+    def _entry(self, key, item):
+        if self.predicate and not self.predicate(item):
+            return None
+        part = self.partition(item) if self.partition else None
+        return part, (self.sort_key(item), key)
+
+    def _add(self, key, item):
+        entry = self._entry(key, item)
+        if entry is None:
+            return
+        part, position = entry
+        insort(self._orders.setdefault(part, []), position)
+        self._entries[key] = entry
+        self._items[key] = item
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        self._items.pop(key, None)
+        if entry is None:
+            return
+        part, position = entry
+        order = self._orders.get(part, [])
+        i = bisect_left(order, position)
+        if i < len(order) and order[i] == position:
+            del order[i]
+
+    def reset(self, data):
+        orders, entries, items = {}, {}, {}
+        pairs = data.items() if isinstance(data, dict) else ((item_key(self.collection, i), i) for i in data)
+        for key, item in pairs:
+            entry = self._entry(key, item)
+            if entry is None:
+                continue
+            part, position = entry
+            orders.setdefault(part, []).append(position)
+            entries[key] = entry
+            items[key] = item
+        for order in orders.values():
+            order.sort()
+        with self._lock:
+            self._orders, self._entries, self._items = orders, entries, items
+
+    def on_op(self, op, old):
+        key = op['key']
+        entry = self._entry(key, op['item']) if op['op'] == 'put' else None
+        with self._lock:
+            if entry is not None and entry == self._entries.get(key):
+                # Position unchanged (e.g. an edit that doesn't touch the sort key)
+                self._items[key] = op['item']
+                return
+            self._remove(key)
+            if op['op'] == 'put':
+                self._add(key, op['item'])
+
+    def count(self, partition=None):
+        with self._lock:
+            return len(self._orders.get(partition, ()))
+
+    def items(self, offset=0, limit=None, partition=None):
+        """Entities from position offset, highest sort key first"""
+        with self._lock:
+            order = self._orders.get(partition, [])
+            end = len(order) - offset
+            start = 0 if limit is None else max(end - limit, 0)
+            if end <= 0:
+                return []
+            return [self._items[key] for _, key in reversed(order[start:end])]
+
+    def page(self, cursor=None, limit=10, partition=None):
+        """Keyset page: up to limit entities ranked below cursor.
+
+        cursor is a position returned by a previous call (None for the first
+        page). Returns (items, next_cursor); next_cursor is None on the last
+        page. The cursor is found with bisect, so deep pages cost the same as
+        the first one and inserts between requests don't shift results.
+        """
+        with self._lock:
+            order = self._orders.get(partition, [])
+            end = len(order) if cursor is None else bisect_left(order, cursor)
+            start = max(end - limit, 0)
+            entries = order[start:end][::-1]
+            next_cursor = entries[-1] if start > 0 and entries else None
+            return [self._items[key] for _, key in entries], next_cursor
@@ -0,0 +1,47 @@
+import atexit
+import threading
+
+
+class WriteBehindFlusher:
+    """Background thread that flushes a store's deferred writes.
+
+    `interval` is the durability window: a deferred change reaches the
+    backend at most that many seconds later (sooner if the store's
+    flush_threshold is hit). Pending changes are also flushed at exit.
+    `sources` are buffers with a flush_into(store) method (e.g. view
+    counters) that are drained into the store right before each flush.
+    """
+
+    def __init__(self, store, interval=5, sources=()):
+        self.store = store
+        self.interval = interval
+        self.sources = list(sources)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """Stop the thread and write whatever is still pending"""
+        self._stop.set()
+        self.run_once()
+
+    def run_once(self):
+        for source in self.sources:
+            try:
+                source.flush_into(self.store)
+            except Exception as e:
+                print(f"❌ Write-behind source error: {e}")
+        try:
+            self.store.flush()
+        except Exception as e:
+            print(f"❌ Write-behind flush error: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
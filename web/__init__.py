@@ -0,0 +1,4 @@
+from .fragments import FragmentCache
+from .http_cache import version_etag, is_fresh, conditional_json, content_etag_json, encoded_response
+from .roadmap import RoadmapData
+from .assets import AssetManifest, serve_built
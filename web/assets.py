@@ -0,0 +1,172 @@
+"""Minify, fingerprint and pre-gzip the JS/CSS files in static/.
+
+    python -m web.assets [--static static]
+
+Every asset is written to static/dist/<name>.<hash>.<ext> together with a
+.gz copy, and static/dist/manifest.json maps the source name to the built
+one. Templates link assets through asset_url(), which falls back to the
+plain file when the build hasn't been run.
+"""
+import os
+import re
+import sys
+import json
+import gzip
+import hashlib
+import argparse
+import threading
+
+from flask import request, send_from_directory, url_for
+
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+EXTENSIONS = ('.js', '.css')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# <name>.<sha256[:12]>.<ext>, as written by fingerprinted_name()
+_FINGERPRINTED = re.compile(r'\.[0-9a-f]{12}\.[A-Za-z0-9]+$')
+
+_CSS_STRINGS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+_CSS_COMMENTS = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCT = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(text):
+    parts = _CSS_STRINGS.split(_CSS_COMMENTS.sub('', text))
+    for i in range(0, len(parts), 2):  # odd indexes are string literals
+        part = _CSS_SPACE.sub(' ', parts[i])
+        parts[i] = _CSS_PUNCT.sub(r'\1', part).replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def minify_js(text):
+    """Drop indentation, trailing blanks and empty lines.
+
+    Without a JS parser, anything riskier (comments, spaces inside lines)
+    is left alone; lines inside template literals keep their indentation.
+    """
+    out, in_template = [], False
+    for line in text.splitlines():
+        stripped = line.rstrip()
+        if not in_template:
+            stripped = stripped.lstrip()
+            if not stripped:
+                continue
+        out.append(stripped)
+        # Backticks not escaped toggle template-literal state (good enough for hand-written code)
+        if (stripped.count('`') - stripped.count('\\`')) % 2:
+            in_template = not in_template
+    return '\n'.join(out) + '\n'
+
+
+def _minify(name, text):
+    return minify_css(text) if name.endswith('.css') else minify_js(text)
+
+
+def fingerprinted_name(name, body):
+    base, ext = os.path.splitext(name)
+    return f'{base}.{hashlib.sha256(body).hexdigest()[:12]}{ext}'
+
+
+def build(static_dir='static'):
+    """Build static/dist and its manifest; returns the manifest"""
+    dist = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist, exist_ok=True)
+    manifest = {}
+    for name in sorted(os.listdir(static_dir)):
+        path = os.path.join(static_dir, name)
+        if not name.endswith(EXTENSIONS) or not os.path.isfile(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            body = _minify(name, f.read()).encode('utf-8')
+        built = fingerprinted_name(name, body)
+        target = os.path.join(dist, built)
+        if not os.path.exists(target):
+            with open(target, 'wb') as f:
+                f.write(body)
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzip.compress(body, 9, mtime=0))
+        manifest[name] = f'{DIST_DIR}/{built}'
+        print(f"✅ {name}: {os.path.getsize(path)} -> {len(body)} bytes ({os.path.getsize(target + '.gz')} gzipped)")
+    tmp_path = os.path.join(dist, MANIFEST + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(dist, MANIFEST))
+    # Builds from older deploys are kept on purpose: pages cached by browsers may still link them
+    return manifest
+
+
+class AssetManifest:
+    """Source name -> fingerprinted name, re-read when the manifest file changes"""
+
+    def __init__(self, static_dir='static'):
+        self.path = os.path.join(static_dir, DIST_DIR, MANIFEST)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._names = {}
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+            signature = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            signature = None
+        if signature == self._signature:
+            return
+        with self._lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    names = json.load(f)
+            except FileNotFoundError:
+                names = {}
+            except ValueError as e:
+                print(f"❌ Asset manifest error ({self.path}): {e}")
+                names = {}
+            self._names, self._signature = names, signature
+
+    def resolve(self, filename):
+        self._refresh()
+        return self._names.get(filename, filename)
+
+    def url(self, filename):
+        """URL of an asset: the fingerprinted build when there is one, else the source file"""
+        return url_for('static', filename=self.resolve(filename))
+
+
+def serve_built(static_dir, filename):
+    """Send a built file, pre-gzipped when the client accepts it.
+
+    Only fingerprinted files get far-future caching; anything else in dist/
+    (the manifest) changes under the same name and is revalidated each time.
+    """
+    dist = os.path.join(static_dir, DIST_DIR)
+    gzipped = filename + '.gz'
+    if 'gzip' in request.accept_encodings and os.path.isfile(os.path.join(dist, gzipped)):
+        response = send_from_directory(dist, gzipped, mimetype=_mimetype(filename), etag=False)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = send_from_directory(dist, filename, etag=False)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE if _FINGERPRINTED.search(filename) else 'no-cache'
+    return response
+
+
+def _mimetype(filename):
+    if filename.endswith('.css'):
+        return 'text/css'
+    if filename.endswith('.js'):
+        return 'text/javascript'
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Minify, fingerprint and gzip static JS/CSS')
+    parser.add_argument('--static', default='static')
+    args = parser.parse_args(argv)
+    build(args.static)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
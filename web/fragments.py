@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+
+from storage import StoreListener
+
+
+class FragmentCache(StoreListener):
+    """LRU cache of rendered HTML, invalidated by store ops.
+
+    Fragments are keyed by (entity key, entity version, variant), where
+    variant holds whatever else the markup depends on (e.g. whether the
+    viewer may delete it). Every op on an entity bumps its version and
+    drops its fragments. `children` optionally maps an entity to
+    {child id: child} (answers inside a question); only children that
+    actually changed are invalidated, so a new answer doesn't throw away
+    the other answers' HTML. Fields in `ignore` (e.g. view counts) aren't
+    part of any fragment: an op that changes nothing else keeps them all.
+    Total cached size (UTF-8 bytes) is kept under max_bytes.
+    """
+
+    def __init__(self, collection, children=None, max_bytes=8 * 1024 * 1024, ignore=()):
+        self.collection = collection
+        self.children = children
+        self.max_bytes = max_bytes
+        self.ignore = frozenset(ignore)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_entity = {}
+        self._versions = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _drop(self, cache_key):
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[1]
+        keys = self._by_entity.get(cache_key[0])
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del self._by_entity[cache_key[0]]
+
+    def _invalidate(self, entity):
+        self._versions[entity] = self._versions.get(entity, 0) + 1
+        for cache_key in list(self._by_entity.get(entity, ())):
+            self._drop(cache_key)
+
+    def reset(self, data):
+        with self._lock:
+            self._entries.clear()
+            self._by_entity.clear()
+            self._bytes = 0
+            # Versions only grow, so anything rendered concurrently stays unreachable
+            for entity in list(self._versions):
+                self._versions[entity] += 1
+
+    def _visible(self, item):
+        return {k: v for k, v in item.items() if k not in self.ignore}
+
+    def on_op(self, op, old):
+        key = op['key']
+        new = op['item'] if op['op'] == 'put' else None
+        if self.ignore and old is not None and new is not None and self._visible(old) == self._visible(new):
+            return
+        with self._lock:
+            self._invalidate(key)
+            if self.children is None:
+                return
+            before = self.children(old) if old else {}
+            after = self.children(new) if new else {}
+            for child in set(before) | set(after):
+                if before.get(child) != after.get(child):
+                    self._invalidate((key, child))
+
+    def get_or_render(self, entity, variant, render):
+        """Cached HTML for (entity, variant), calling render() on a miss"""
+        with self._lock:
+            cache_key = (entity, self._versions.get(entity, 0), variant)
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+        html = render()
+        size = len(html.encode('utf-8'))
+        with self._lock:
+            # Skip the insert if the entity changed while rendering
+            if cache_key[1] == self._versions.get(entity, 0) and size <= self.max_bytes:
+                self._drop(cache_key)
+                self._entries[cache_key] = (html, size)
+                self._by_entity.setdefault(entity, set()).add(cache_key)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+        return html
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self._hits, 'misses': self._misses}
@@ -0,0 +1,79 @@
+import time
+from datetime import datetime, timezone
+
+from flask import request, jsonify, Response
+
+
+def version_etag(store, *collections):
+    """Strong ETag naming the current version of each collection"""
+    parts = [f'{name}.{store.version(name)}' for name in collections]
+    return f'{store.epoch}-' + '-'.join(parts)
+
+
+def _settled(last_modified):
+    """Whether the second of the last change is over.
+
+    HTTP dates have one-second precision: while that second is still
+    running another change can get the same date, so the date can't
+    tell the two versions apart yet.
+    """
+    return last_modified is not None and int(last_modified) < int(time.time())
+
+
+def _set_last_modified(response, last_modified):
+    if _settled(last_modified):
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+
+
+def is_fresh(etag, last_modified=None):
+    """Whether the client's copy (If-None-Match / If-Modified-Since) is still current.
+
+    If-None-Match wins when both are sent, as RFC 9110 requires; the date
+    is only trusted once the second of the last change is over.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains(etag) or request.if_none_match.star_tag
+    if _settled(last_modified) and request.if_modified_since is not None:
+        return int(last_modified) <= request.if_modified_since.timestamp()
+    return False
+
+
+def conditional_json(etag, build, last_modified=None, private=False):
+    """jsonify(build()) with validators, or an empty 304 without calling build()"""
+    if is_fresh(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    _set_last_modified(response, last_modified)
+    # Cache, but ask before every reuse
+    response.cache_control.no_cache = True
+    if private:
+        response.cache_control.private = True
+    return response
+
+
+def content_etag_json(payload, private=False):
+    """For small per-user bodies: the ETag is a hash of the body itself"""
+    response = jsonify(payload)
+    response.add_etag()
+    response.cache_control.no_cache = True
+    if private:
+        response.cache_control.private = True
+    return response.make_conditional(request)
+
+
+def encoded_response(encoded, content_type='application/json'):
+    """Serve a pre-serialized body (web.roadmap.Encoded), gzipped if the client accepts it"""
+    if is_fresh(encoded.etag, encoded.last_modified):
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(encoded.gzipped, content_type=content_type)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(encoded.body, content_type=content_type)
+    response.vary.add('Accept-Encoding')
+    response.set_etag(encoded.etag)
+    _set_last_modified(response, encoded.last_modified)
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,96 @@
+import os
+import json
+import gzip
+import hashlib
+import threading
+from collections import namedtuple
+
+# One response body prepared ahead of time
+Encoded = namedtuple('Encoded', 'body gzipped etag last_modified')
+
+_SUMMARY_FIELDS = ('id', 'title', 'description', 'icon')
+
+
+def encode(payload, last_modified=None):
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return Encoded(body, gzip.compress(body, 9, mtime=0), hashlib.sha1(body).hexdigest()[:20], last_modified)
+
+
+def validate(data):
+    """Raise ValueError unless data looks like roadmap_data.json"""
+    if not isinstance(data, dict) or not isinstance(data.get('roadmaps'), list):
+        raise ValueError('expected {"roadmaps": [...]}')
+    seen = set()
+    for roadmap in data['roadmaps']:
+        if not isinstance(roadmap, dict) or not isinstance(roadmap.get('id'), str):
+            raise ValueError('every roadmap needs a string id')
+        if roadmap['id'] in seen:
+            raise ValueError(f"duplicate roadmap id {roadmap['id']!r}")
+        seen.add(roadmap['id'])
+        nodes = roadmap.get('nodes')
+        if not isinstance(nodes, list):
+            raise ValueError(f"roadmap {roadmap['id']!r} has no nodes list")
+        node_ids = [node.get('id') for node in nodes if isinstance(node, dict)]
+        if len(node_ids) != len(nodes) or None in node_ids or len(set(node_ids)) != len(node_ids):
+            raise ValueError(f"roadmap {roadmap['id']!r} has nodes without unique ids")
+
+
+class RoadmapData:
+    """roadmap_data.json kept in memory as ready-to-send JSON and gzip bodies.
+
+    The file is parsed and validated once, then re-read only when its
+    mtime/size changes; a broken edit is reported and the last good copy
+    keeps being served. Besides the whole document there is a summary
+    (tracks without their lessons) and one body per track.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._full = None
+        self._summary = None
+        self._tracks = {}
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            st = None
+        signature = (st.st_mtime_ns, st.st_size) if st else None
+        with self._lock:
+            if signature == self._signature and self._full is not None:
+                return
+            if st is None:
+                data, modified = {'roadmaps': []}, None
+            else:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    validate(data)
+                except ValueError as e:
+                    print(f"❌ Roadmap data error ({self.path}): {e}")
+                    if self._full is not None:
+                        self._signature = signature  # don't re-parse the same broken file
+                        return
+                    data = {'roadmaps': []}
+                modified = st.st_mtime
+            self._full = encode(data, modified)
+            self._summary = encode({'roadmaps': [
+                dict({k: r.get(k) for k in _SUMMARY_FIELDS}, node_count=len(r['nodes'])) for r in data['roadmaps']
+            ]}, modified)
+            self._tracks = {r['id']: encode(r, modified) for r in data['roadmaps']}
+            self._signature = signature
+
+    def full(self):
+        self._refresh()
+        return self._full
+
+    def summary(self):
+        self._refresh()
+        return self._summary
+
+    def track(self, roadmap_id):
+        """Encoded body for one roadmap, None if there is no such id"""
+        self._refresh()
+        return self._tracks.get(roadmap_id)